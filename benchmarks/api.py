@@ -0,0 +1,212 @@
+"""End-to-end latency benchmark of the real `main:app` routes.
+
+    python -m benchmarks.api [--users 200] [--gifts-per-user 50]
+                             [--concurrency 1 8 32] [--requests 500]
+                             [--output results.json] [--compare baseline.json]
+
+Seeds a throwaway SQLite database, then drives every scenario through an
+in-process ASGI client at each concurrency level and reports throughput and
+p50/p95/p99 latency. Results are written as JSON, and `--compare` prints the
+change against an earlier run so regressions in utils/sql_api.py or the
+routers stand out. add_gift runs its huey task inline with a stub parser.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.common import (
+    BENCH_PASSWORD,
+    configure,
+    make_client,
+    seed,
+    summarize,
+    timed_request,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def stub_parse(link: str) -> dict:
+    return {"name": "Stub gift", "cost": 499.0, "photo": "https://example.com/1.jpg"}
+
+
+def build_scenarios(users: list[dict], tokens: dict[str, str], gifts_per_user: int):
+    counter = itertools.count()
+
+    def pick_user(i: int) -> dict:
+        return users[i % len(users)]
+
+    def gift_id(i: int) -> str:
+        return f"gift-{i % len(users):06d}-{i % gifts_per_user:04d}"
+
+    def auth(user: dict) -> dict:
+        return {"Authorization": f"Bearer {tokens[user['username']]}"}
+
+    def reserve(i: int):
+        user = pick_user(i)
+        gift = {
+            "id": gift_id(i),
+            "name": f"Gift {i % gifts_per_user} of user {i % len(users)}",
+            "cost": 100.0 + i % gifts_per_user,
+            "link": f"https://www.ozon.ru/product/{i}/",
+            "photo": None,
+            "is_reserved": True,
+            "reserve_owner": "bench",
+            "user_id": user["user_id"],
+        }
+        return "PUT", f"/gifts/{gift['id']}", {"json": gift}
+
+    return {
+        "list_gifts": lambda i: ("GET", "/gifts/", {}),
+        "list_gifts_page": lambda i: ("GET", "/gifts/?limit=50", {}),
+        "user_gifts": lambda i: ("GET", f"/gifts/user/{pick_user(i)['user_id']}", {}),
+        "get_gift": lambda i: ("GET", f"/gifts/{gift_id(i)}", {}),
+        "login": lambda i: (
+            "POST",
+            "/login",
+            {
+                "json": {
+                    "username": pick_user(i)["username"],
+                    "password": BENCH_PASSWORD,
+                }
+            },
+        ),
+        "add_gift": lambda i: (
+            "POST",
+            "/gifts/",
+            {
+                "json": {"link": f"https://www.ozon.ru/product/bench-{next(counter)}/"},
+                "headers": auth(pick_user(i)),
+            },
+        ),
+        "reserve": reserve,
+    }
+
+
+async def run_level(client, scenario, concurrency: int, requests: int) -> dict:
+    samples, errors = [], 0
+    indexes = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in indexes:
+            method, url, kwargs = scenario(i)
+            response = await timed_request(client, method, url, samples, **kwargs)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - started, errors)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict):
+    print(f"\n{'scenario':<18}{'conc':>6}{'rps':>18}{'p50 ms':>20}{'p99 ms':>20}")
+    for name, levels in current["results"].items():
+        for level, stats in levels.items():
+            before = baseline["results"].get(name, {}).get(level)
+            if not before:
+                continue
+            cells = []
+            for key in ("rps", "p50_ms", "p99_ms"):
+                old, new = before[key], stats[key]
+                change = (new - old) / old * 100 if old else 0.0
+                cells.append(f"{new:>9.1f} ({change:+6.1f}%)")
+            print(f"{name:<18}{level:>6}" + "".join(f"{c:>20}" for c in cells))
+
+
+async def run(args):
+    configure(args.workdir)
+    users = seed(args.users, args.gifts_per_user)
+
+    import tasks
+    from huey_config import huey
+    from main import app
+
+    huey.immediate = True
+    tasks.parse_url = stub_parse
+    tasks.make_thumbnail = lambda photo: None
+
+    selected = set(args.scenarios or [])
+    results = {}
+    async with make_client(app) as client:
+        tokens = {}
+        for user in users[: args.token_users]:
+            response = await client.post(
+                "/login",
+                json={"username": user["username"], "password": BENCH_PASSWORD},
+            )
+            tokens[user["username"]] = response.json()["access_token"]
+
+        scenarios = build_scenarios(
+            users[: args.token_users], tokens, args.gifts_per_user
+        )
+        for name, scenario in scenarios.items():
+            if selected and name not in selected:
+                continue
+            requests = args.requests if name != "login" else args.login_requests
+            results[name] = {}
+            for concurrency in args.concurrency:
+                stats = await run_level(client, scenario, concurrency, requests)
+                results[name][str(concurrency)] = stats
+                print(
+                    f"{name:<18} c={concurrency:<4} {stats['rps']:>9.1f} rps"
+                    f"  p50 {stats['p50_ms']:>8.2f}  p95 {stats['p95_ms']:>8.2f}"
+                    f"  p99 {stats['p99_ms']:>8.2f} ms  errors {stats['errors']}"
+                )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "users": args.users,
+            "gifts_per_user": args.gifts_per_user,
+            "requests": args.requests,
+        },
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"api-{report['meta']['revision']}-{int(time.time())}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved results to {output}")
+
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text()))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--gifts-per-user", type=int, default=50)
+    parser.add_argument("--token-users", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--login-requests", type=int, default=50)
+    parser.add_argument("--scenarios", nargs="*")
+    parser.add_argument("--workdir")
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Shared helpers for the API benchmarks.
+
+`configure()` must run before anything from the application is imported,
+because the app reads its settings from the environment at import time.
+"""
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_PASSWORD = "bench-password"
+
+
+def configure(workdir: str | None = None) -> Path:
+    workdir = Path(workdir or tempfile.mkdtemp(prefix="gifts-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.environ["DATABASE_URL"] = str(workdir / "gifts.db")
+    os.environ["TASKBASE_URL"] = str(workdir / "tasks.db")
+    os.environ.setdefault("KEY", "bench-secret")
+    os.environ.setdefault("PRODUCTION", "0")
+    return workdir
+
+
+def seed(users: int, gifts_per_user: int) -> list[dict]:
+    """Insert `users` users with `gifts_per_user` gifts each and return the users."""
+    from utils.auth import pwd_context
+    from utils.sql_api import DB
+
+    db = DB()
+    db.create_tables()
+    password = pwd_context.hash(BENCH_PASSWORD)
+    seeded = [
+        {"user_id": f"user-{i:06d}", "username": f"bench{i}", "password": password}
+        for i in range(users)
+    ]
+    db.connection.executemany(
+        "INSERT INTO users (id, username, password) VALUES (?, ?, ?)",
+        [(u["user_id"], u["username"], u["password"]) for u in seeded],
+    )
+    db.connection.executemany(
+        """
+        INSERT INTO gifts (id, name, cost, link, photo, is_reserved, reserve_owner, user_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            (
+                f"gift-{i:06d}-{j:04d}",
+                f"Gift {j} of user {i}",
+                100.0 + j,
+                f"https://www.ozon.ru/product/{i * 10000 + j}/",
+                "https://cdn1.ozone.ru/s3/multimedia-1-x/wc1000/1.jpg",
+                False,
+                "",
+                seeded[i]["user_id"],
+            )
+            for i in range(users)
+            for j in range(gifts_per_user)
+        ),
+    )
+    db.connection.commit()
+    db.close()
+    return seeded
+
+
+def make_client(app):
+    import httpx
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    )
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list[float], elapsed: float, errors: int = 0) -> dict:
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(samples), 2) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+    }
+
+
+async def timed_request(client, method: str, url: str, samples: list, **kwargs):
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    samples.append((time.perf_counter() - started) * 1000)
+    return response
@@ -0,0 +1,98 @@
+"""Login throughput against concurrent gift reads.
+
+    python -m benchmarks.login [--logins 8] [--readers 8] [--duration 10]
+                               [--inline-hashing]
+
+Runs login and GET gifts/ workers side by side on one event loop and reports
+both. `--inline-hashing` hashes on the event loop thread, which is how login
+used to work, to show what the bcrypt worker pool buys.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import (
+    BENCH_PASSWORD,
+    configure,
+    make_client,
+    seed,
+    summarize,
+    timed_request,
+)
+
+
+async def worker(client, method, url, samples, errors, deadline, **kwargs):
+    while time.perf_counter() < deadline:
+        response = await timed_request(client, method, url, samples, **kwargs)
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+
+
+async def run(args):
+    configure()
+    users = seed(max(args.logins, 1), args.gifts_per_user)
+
+    import utils.auth
+    from main import app
+
+    if args.inline_hashing:
+        async def run_inline(func, *func_args):
+            return func(*func_args)
+
+        utils.auth._run_hash = run_inline
+
+    login_samples, login_errors = [], []
+    read_samples, read_errors = [], []
+    async with make_client(app) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                worker(
+                    client,
+                    "POST",
+                    "/login",
+                    login_samples,
+                    login_errors,
+                    deadline,
+                    json={
+                        "username": users[i % len(users)]["username"],
+                        "password": BENCH_PASSWORD,
+                    },
+                )
+                for i in range(args.logins)
+            ),
+            *(
+                worker(client, "GET", "/gifts/", read_samples, read_errors, deadline)
+                for _ in range(args.readers)
+            ),
+        )
+        elapsed = time.perf_counter() - started
+
+    print(
+        json.dumps(
+            {
+                "bcrypt_rounds": utils.auth.BCRYPT_ROUNDS,
+                "hash_workers": utils.auth.HASH_WORKERS,
+                "inline_hashing": args.inline_hashing,
+                "login": summarize(login_samples, elapsed, len(login_errors)),
+                "gift_reads": summarize(read_samples, elapsed, len(read_errors)),
+            },
+            indent=2,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--gifts-per-user", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--inline-hashing", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Offline benchmark of the parser paths against recorded HTML fixtures.
+
+    python -m benchmarks.parsers [--iterations 200] [--browser]
+
+The fixtures are served from a local HTTP server, so the HTTP path is timed
+end to end including the fetch. `--browser` also times the browser fallback
+and needs Chrome. Both paths refuse loopback addresses outside the harness.
+"""
+import argparse
+import ipaddress
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from utils import http_client
+from utils.extract import extract_product
+from utils.parsers.generic import parse_url_http
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures() -> ThreadingHTTPServer:
+    handler = partial(QuietHandler, directory=str(FIXTURES))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@contextmanager
+def allow_loopback():
+    """Let fetch and the browser pool reach the local fixture server."""
+    is_public_address = http_client.is_public_address
+    http_client.is_public_address = lambda address: (
+        ipaddress.ip_address(address).is_loopback or is_public_address(address)
+    )
+    try:
+        yield
+    finally:
+        http_client.is_public_address = is_public_address
+
+
+def timed(func, iterations: int) -> tuple[object, list[float]]:
+    result, samples = None, []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return result, samples
+
+
+def report(label: str, result, samples: list[float]):
+    print(
+        f"{label:<40} median {statistics.median(samples):8.2f} ms"
+        f"  max {max(samples):8.2f} ms  -> {result}"
+    )
+
+
+def bench_fixture(
+    fixture: Path, base_url: str, iterations: int, browser: bool = False
+) -> list[tuple[str, object, list[float]]]:
+    """Time every parser path over one fixture; `(label, result, samples)` rows."""
+    page = fixture.read_text(encoding="utf-8")
+    url = base_url + fixture.name
+    rows = [
+        (
+            f"extract  {fixture.name}",
+            *timed(lambda page=page: extract_product(page), iterations),
+        ),
+        (
+            f"http     {fixture.name}",
+            *timed(lambda url=url: parse_url_http(url), iterations),
+        ),
+    ]
+    if browser:
+        from utils.parsers.ozon import parse_url_ozon_browser
+
+        rows.append(
+            (
+                f"browser  {fixture.name}",
+                *timed(lambda url=url: parse_url_ozon_browser(url), 3),
+            )
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--browser", action="store_true")
+    args = parser.parse_args()
+
+    server = serve_fixtures()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        with allow_loopback():
+            for fixture in sorted(FIXTURES.glob("*.html")):
+                for row in bench_fixture(
+                    fixture, base_url, args.iterations, args.browser
+                ):
+                    report(*row)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
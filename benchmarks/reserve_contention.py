@@ -0,0 +1,99 @@
+"""Many friends reserving the same gifts at once.
+
+    python -m benchmarks.reserve_contention [--gifts 20] [--reservers 50]
+                                            [--legacy]
+
+Every gift gets `--reservers` concurrent reservation attempts. The atomic
+PATCH gifts/{id}/reserve must grant exactly one per gift and answer 409 to
+the rest. `--legacy` replays the old read-then-PUT flow for comparison and
+counts the reservations it lost to overwrites.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+from benchmarks.common import configure, make_client, seed, summarize, timed_request
+
+
+async def reserve_atomic(client, gift_id: str, owner: str, samples: list) -> int:
+    response = await timed_request(
+        client,
+        "PATCH",
+        f"/gifts/{gift_id}/reserve",
+        samples,
+        json={"reserve_owner": owner},
+    )
+    return response.status_code
+
+
+async def reserve_legacy(client, gift_id: str, owner: str, samples: list) -> int:
+    started = time.perf_counter()
+    gift = (await client.get(f"/gifts/{gift_id}")).json()["gift"]
+    if gift["is_reserved"]:
+        samples.append((time.perf_counter() - started) * 1000)
+        return 409
+    gift.update(is_reserved=True, reserve_owner=owner)
+    response = await client.put(f"/gifts/{gift_id}", json=gift)
+    samples.append((time.perf_counter() - started) * 1000)
+    return response.status_code
+
+
+async def run(args):
+    configure()
+    users = seed(1, args.gifts)
+    gift_ids = [f"gift-000000-{j:04d}" for j in range(args.gifts)]
+
+    from main import app
+
+    reserve = reserve_legacy if args.legacy else reserve_atomic
+    samples = []
+    async with make_client(app) as client:
+        started = time.perf_counter()
+        attempts = [
+            (gift_id, f"friend-{n}")
+            for n in range(args.reservers)
+            for gift_id in gift_ids
+        ]
+        statuses = await asyncio.gather(
+            *(reserve(client, gift_id, owner, samples) for gift_id, owner in attempts)
+        )
+        elapsed = time.perf_counter() - started
+
+        granted = Counter(
+            gift_id
+            for (gift_id, _), code in zip(attempts, statuses)
+            if code == 200
+        )
+        final_owners = {}
+        for gift_id in gift_ids:
+            gift = (await client.get(f"/gifts/{gift_id}")).json()["gift"]
+            final_owners[gift_id] = gift["reserve_owner"]
+
+    print(
+        json.dumps(
+            {
+                "mode": "legacy" if args.legacy else "atomic",
+                "owner": users[0]["user_id"],
+                "attempts": len(attempts),
+                "statuses": dict(Counter(statuses)),
+                "gifts_reserved": sum(1 for owner in final_owners.values() if owner),
+                "lost_reservations": sum(count - 1 for count in granted.values()),
+                "latency": summarize(samples, elapsed),
+            },
+            indent=2,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gifts", type=int, default=20)
+    parser.add_argument("--reservers", type=int, default=50)
+    parser.add_argument("--legacy", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Serialization cost of a gift list, per 1k gifts.
+
+    python -m benchmarks.serialization [--gifts 1000] [--iterations 200]
+
+`validated` is what FastAPI does for a `-> GiftsPage` handler returning row
+dicts: validate into the model, dump in JSON mode, then `json.dumps`. The
+other rows time the trusted path used by the list endpoints, with and
+without a `fields=` projection.
+"""
+import argparse
+import json
+import statistics
+import time
+
+from pydantic import TypeAdapter
+
+from benchmarks.common import percentile
+from models.Gift import GIFT_FIELDS, GiftsPage
+from utils.serialization import dumps, orjson, project
+
+
+def make_rows(count: int) -> list[dict]:
+    return [
+        {
+            "id": f"gift-{i:06d}",
+            "name": f"Подарок номер {i} с довольно длинным названием",
+            "cost": 1000.0 + i,
+            "link": f"https://www.ozon.ru/product/{i}/",
+            "photo": f"https://cdn1.ozone.ru/s3/multimedia-1-x/wc1000/{i}.jpg",
+            "thumbnail": None,
+            "is_reserved": i % 3 == 0,
+            "reserve_owner": "",
+            "user_id": "user-000001",
+            "price_checked_at": 1700000000.0,
+        }
+        for i in range(count)
+    ]
+
+
+def validated(rows: list[dict]) -> bytes:
+    adapter = TypeAdapter(GiftsPage)
+    content = adapter.dump_python(
+        adapter.validate_python({"gifts": rows}), mode="json"
+    )
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def timed(func, iterations: int) -> tuple[int, list[float]]:
+    size, samples = 0, []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        size = len(func())
+        samples.append((time.perf_counter() - started) * 1000)
+    return size, samples
+
+
+def report(label: str, size: int, samples: list[float], per: float):
+    print(
+        f"{label:<28} median {statistics.median(samples) / per:8.3f} ms/1k"
+        f"  p99 {percentile(samples, 99) / per:8.3f} ms/1k"
+        f"  {size / 1024:8.1f} KiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gifts", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.gifts)
+    per = args.gifts / 1000
+    slim = ("id", "name", "cost", "thumbnail")
+    print(f"encoder: {'orjson' if orjson is not None else 'json (orjson missing)'}")
+
+    report("validated", *timed(lambda: validated(rows), args.iterations), per)
+    report(
+        "trusted",
+        *timed(
+            lambda: dumps({"gifts": project(rows, GIFT_FIELDS), "next": None}),
+            args.iterations,
+        ),
+        per,
+    )
+    report(
+        f"trusted fields={','.join(slim)}",
+        *timed(
+            lambda: dumps({"gifts": project(rows, slim), "next": None}),
+            args.iterations,
+        ),
+        per,
+    )
+
+
+if __name__ == "__main__":
+    main()
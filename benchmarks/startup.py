@@ -0,0 +1,75 @@
+"""Import time and startup time of the API process.
+
+    python -m benchmarks.startup [--runs 10]
+
+Every sample runs in a fresh interpreter, like a reload or a new replica.
+`import main` and `startup` (import plus the lifespan startup, which applies
+migrations) are what the API pays; `import utils.parsers` is the worker-only
+parser stack it no longer loads. Also lists heavy modules that `main` pulled in.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import configure
+
+HEAVY_MODULES = ("selenium", "seleniumbase", "PIL")
+
+SNIPPETS = {
+    "import main": "import main",
+    "startup": (
+        "import asyncio, main\n"
+        "async def start():\n"
+        "    async with main.app.router.lifespan_context(main.app):\n"
+        "        pass\n"
+        "asyncio.run(start())"
+    ),
+    "import utils.parsers": "import utils.parsers",
+}
+
+
+def run_sample(snippet: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        f"{snippet}\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'ms': elapsed * 1000, 'heavy': heavy}))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=os.environ.copy(),
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--workdir", default=None)
+    args = parser.parse_args()
+
+    configure(args.workdir)
+    for label, snippet in SNIPPETS.items():
+        try:
+            samples = [run_sample(snippet) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as e:
+            print(f"{label:<22} failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        times = [sample["ms"] for sample in samples]
+        heavy = ", ".join(samples[-1]["heavy"]) or "-"
+        print(
+            f"{label:<22} median {statistics.median(times):8.1f} ms"
+            f"  max {max(times):8.1f} ms  heavy modules: {heavy}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
-from routers import gifts, users, db
+from routers import gifts, thumbnails, users, db
 from huey_config import huey  # noqa: F401
-from tasks import parse_ozon_task  # noqa: F401
+from tasks import parse_gift_task, WORKER_METRICS_KEY  # noqa: F401
+from utils import logger
+from utils.auth import hash_queue_depth
+from utils.metrics import Gauge, Histogram, registry, render
 
 app = FastAPI()
 
@@ -20,16 +26,71 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+request_duration = Histogram(
+    "gifts_http_request_duration_seconds",
+    "Time to produce a response, by route.",
+    ["method", "route", "status"],
+)
+requests_in_flight = Gauge(
+    "gifts_http_requests_in_flight", "Requests currently being handled."
+)
+huey_queue_depth = Gauge("gifts_huey_queue_depth", "Tasks waiting in the huey queue.")
+huey_scheduled = Gauge("gifts_huey_scheduled", "Tasks scheduled for a later run.")
+hash_queue = Gauge(
+    "gifts_hash_queue_depth", "Password hashing jobs waiting for a worker."
+)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    requests_in_flight.inc()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        requests_in_flight.dec()
+        route = request.scope.get("route")
+        request_duration.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=route.path if route else "unmatched",
+            status=status_code,
+        )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    def read_huey():
+        huey_queue_depth.set(huey.pending_count())
+        huey_scheduled.set(huey.scheduled_count())
+        return huey.get(WORKER_METRICS_KEY, peek=True) or []
+
+    worker_families = await asyncio.to_thread(read_huey)
+    hash_queue.set(hash_queue_depth())
+    return PlainTextResponse(
+        render(
+            (registry.collect(), {"process": "api"}),
+            (worker_families, {"process": "worker"}),
+        ),
+        media_type="text/plain; version=0.0.4",
+    )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting up...")
+    await db.create_tables()
     yield
     print("Shutting down...")
     db.close()
+    await logger.complete()
 
 
 app.router.lifespan_context = lifespan
 
 app.include_router(gifts.router)
 app.include_router(users.router)
+app.include_router(thumbnails.router)
@@ -7,6 +7,7 @@ class Gift(BaseModel):
     cost: float
     link: str
     photo: Optional[str]
+    thumbnail: Optional[str] = None
     is_reserved: bool
     reserve_owner: Optional[str]
     user_id: str
@@ -16,4 +17,32 @@ class Gift(BaseModel):
     def check_cost(cls, value):
         if not isinstance(value, float) :
             raise ValueError('Cost must be a valid number')
-        return value
\ No newline at end of file
+        return value
+
+class GiftsPage(BaseModel):
+    gifts: list[Gift]
+    next: Optional[str] = None
+
+
+class GiftPatch(BaseModel):
+    name: Optional[str] = None
+    cost: Optional[float] = None
+    link: Optional[str] = None
+    photo: Optional[str] = None
+    is_reserved: Optional[bool] = None
+    reserve_owner: Optional[str] = None
+
+    # Optional only so fields can be left out; these columns are NOT NULL.
+    @validator('name', 'cost', 'link', 'is_reserved')
+    def check_not_null(cls, value):
+        if value is None:
+            raise ValueError('Field can not be null')
+        return value
+
+
+class Reservation(BaseModel):
+    reserve_owner: str
+
+
+# Response field order of a gift, also the allowed `fields=` projections.
+GIFT_FIELDS = tuple(Gift.model_fields)
@@ -4,4 +4,11 @@ from typing import Optional
 class User(BaseModel):
     user_id: str
     username: str
-    password: Optional[str]
\ No newline at end of file
+    password: Optional[str]
+
+class UsersPage(BaseModel):
+    users: list[User]
+    next: Optional[str] = None
+
+
+USER_FIELDS = tuple(User.model_fields)
@@ -1,14 +1,6 @@
-from utils.sql_api import DB
-from loguru import logger
+from utils import logger
+from utils.sql_api import AsyncDB
 
-logger.add(
-    "logs.log",
-    rotation="10 MB",
-    retention="15 days",
-    compression="zip",
-    level="INFO"
-)
+db = AsyncDB()
 
-db = DB()
-
-__all__ = ["db", "logger"]
\ No newline at end of file
+__all__ = ["db", "logger"]
@@ -1,12 +1,36 @@
 import os
+import json
+import time
+import asyncio
+from typing import Optional
 from uuid import uuid4
 from dotenv import load_dotenv
-from fastapi import APIRouter, HTTPException, Depends, Request, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from utils.auth import get_current_user
-from models.Gift import Gift
+from utils.config import (
+    MAX_PAGE_SIZE,
+    BATCH_MAX_LINKS,
+    TASK_STATUS_POLL_SECONDS,
+    TASK_STATUS_MAX_WAIT_SECONDS,
+    WISHLIST_CACHE_CONTROL,
+    PARSE_INFLIGHT_TTL_SECONDS,
+    IMPORT_MAX_ERRORS,
+    IMPORT_MAX_LINE_BYTES,
+    STREAM_BATCH_SIZE,
+)
+from utils.etag import make_etag, etag_matches
+from utils.links import is_supported_link, normalize_link
+from utils.search import decode_cursor, encode_cursor, match_query
+from utils.serialization import FastJSONResponse, parse_fields, project
+from utils.streaming import csv_response, iter_lines, ndjson_response
+from utils.wishlist_io import EXPORT_FIELDS, iter_import_gifts
+from models.Gift import GIFT_FIELDS, Gift, GiftsPage, GiftPatch, Reservation
 from . import db, logger
-from tasks import parse_ozon_task
+from huey_config import huey
+from tasks import parse_gift_task, parse_batch_item_task
+from task_status import get_task_status, TERMINAL_STATUSES
 
 load_dotenv()
 router = APIRouter()
@@ -16,84 +40,292 @@ URL = "/api/" if PRODUCTION else "/"
 
 
 @router.get(URL + "gifts/")
-async def get_gifts() -> dict[str, list[Gift]]:
+async def get_gifts(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = None,
+) -> GiftsPage:
+    selected = parse_fields(fields, GIFT_FIELDS)
     try:
         logger.info("Request to get all gifts")
-        gifts = db.get_all_gifts()
+        if stream:
+            return ndjson_response(db.get_gifts_page, "id", selected)
+
+        if limit is not None or after is not None:
+            limit = limit or MAX_PAGE_SIZE
+            gifts = await db.get_gifts_page(limit, after)
+            logger.success("Successfully fetched page of {} gifts", len(gifts))
+            return FastJSONResponse(
+                {
+                    "gifts": project(gifts, selected),
+                    "next": gifts[-1]["id"] if len(gifts) == limit else None,
+                }
+            )
+
+        gifts = await db.get_all_gifts()
 
         if not gifts:
             logger.info("No gifts found in database")
-            return {"gifts": []}
+            return FastJSONResponse({"gifts": [], "next": None})
 
-        logger.success(f"Successfully fetched {len(gifts)} gifts")
-        return {"gifts": gifts}
+        logger.success("Successfully fetched {} gifts", len(gifts))
+        return FastJSONResponse({"gifts": project(gifts, selected), "next": None})
     except Exception as e:
-        logger.error(f"Failed to get gifts: {str(e)}")
+        logger.error("Failed to get gifts: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch gifts",
         )
 
 
+@router.get(URL + "gifts/search")
+async def search_gifts(
+    q: Optional[str] = None,
+    min_cost: Optional[float] = Query(None, ge=0),
+    max_cost: Optional[float] = Query(None, ge=0),
+    reserved: Optional[bool] = None,
+    user_id: Optional[str] = None,
+    sort: Optional[str] = Query(None, pattern="^(rank|id|cost|-cost)$"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> GiftsPage:
+    selected = parse_fields(fields, GIFT_FIELDS)
+    match = match_query(q) if q else None
+    if q and match is None:
+        # Nothing to search for, e.g. only punctuation: nothing can match.
+        return FastJSONResponse({"gifts": [], "next": None})
+    sort = sort or ("rank" if match else "id")
+    if sort == "rank" and match is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sorting by rank needs a text query",
+        )
+    try:
+        cursor = decode_cursor(after, sort) if after else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        logger.info("Searching gifts for {!r}", q)
+        gifts = await db.search_gifts(
+            limit,
+            match=match,
+            min_cost=min_cost,
+            max_cost=max_cost,
+            is_reserved=reserved,
+            user_id=user_id,
+            sort=sort,
+            after=cursor,
+        )
+        logger.success("Search found {} gifts", len(gifts))
+        return FastJSONResponse(
+            {
+                "gifts": project(gifts, selected),
+                "next": encode_cursor(gifts[-1], sort) if len(gifts) == limit else None,
+            }
+        )
+    except Exception as e:
+        logger.error("Failed to search gifts: {}", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search gifts",
+        )
+
+
 @router.get(URL + "gifts/{id}")
 async def get_gift(id: str) -> dict[str, Gift]:
     try:
-        logger.info(f"Request to get gift with ID: {id}")
-        gift = db.get_gift_by_id(id)
+        logger.info("Request to get gift with ID: {}", id)
+        gift = await db.get_gift_by_id(id)
 
         if not gift:
-            logger.warning(f"Gift not found with ID: {id}")
+            logger.warning("Gift not found with ID: {}", id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Gift not found"
             )
 
-        logger.success(f"Successfully fetched gift: {id}")
-        return {"gift": gift}
+        logger.success("Successfully fetched gift: {}", id)
+        return FastJSONResponse({"gift": project([gift], GIFT_FIELDS)[0]})
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get gift {id}: {str(e)}")
+        logger.error("Failed to get gift {}: {}", id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch gift",
         )
 
 
+@router.get(URL + "gifts/{id}/prices")
+async def get_gift_prices(id: str) -> dict[str, list[dict]]:
+    try:
+        prices = await db.get_price_history(id)
+    except Exception as e:
+        logger.error("Failed to get price history for gift {}: {}", id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch price history",
+        )
+
+    if not prices:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Gift not found"
+        )
+    return {"prices": prices}
+
+
 @router.get(URL + "gifts/user/{user_id}")
-async def get_gifts_by_user(user_id: str) -> dict[str, list[Gift]]:
+async def get_gifts_by_user(
+    user_id: str,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = None,
+) -> GiftsPage:
+    selected = parse_fields(fields, GIFT_FIELDS)
     try:
-        user = db.get_user_by_id(user_id)
+        user = await db.get_user_by_id(user_id)
         if user is None: 
             raise
-        logger.info(f"Find user: {user_id}")
+        logger.info("Find user: {}", user_id)
     except Exception as e:
-        logger.error(f"Failed to find user by user_id {user_id}: {str(e)}")
+        logger.error("Failed to find user by user_id {}: {}", user_id, e)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Failed to find user by user_id",
         )
 
+    etag = make_etag(await db.get_wishlist_version(user_id), request)
+    cache_headers = {"ETag": etag, "Cache-Control": WISHLIST_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
     try:
-        logger.info(f"Request to get gifts for user: {user_id}")
-        gifts = db.get_gifts_by_user_id(user_id)
+        logger.info("Request to get gifts for user: {}", user_id)
+        if stream:
+            streamed = ndjson_response(
+                lambda batch_size, cursor: db.get_gifts_page(
+                    batch_size, cursor, user_id
+                ),
+                "id",
+                selected,
+            )
+            streamed.headers.update(cache_headers)
+            return streamed
+
+        if limit is not None or after is not None:
+            limit = limit or MAX_PAGE_SIZE
+            gifts = await db.get_gifts_page(limit, after, user_id)
+            logger.success("Found page of {} gifts for user: {}", len(gifts), user_id)
+            return FastJSONResponse(
+                {
+                    "gifts": project(gifts, selected),
+                    "next": gifts[-1]["id"] if len(gifts) == limit else None,
+                },
+                headers=cache_headers,
+            )
+
+        gifts = await db.get_gifts_by_user_id(user_id)
 
         if not gifts:
-            logger.info(f"No gifts found for user: {user_id}")
-            return {"gifts": []}
+            logger.info("No gifts found for user: {}", user_id)
+            return FastJSONResponse({"gifts": [], "next": None}, headers=cache_headers)
 
-        logger.success(f"Found {len(gifts)} gifts for user: {user_id}")
-        return {"gifts": gifts}
+        logger.success("Found {} gifts for user: {}", len(gifts), user_id)
+        return FastJSONResponse(
+            {"gifts": project(gifts, selected), "next": None}, headers=cache_headers
+        )
 
     except Exception as e:
-        logger.error(f"Failed to get gifts for user {user_id}: {str(e)}")
+        logger.error("Failed to get gifts for user {}: {}", user_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch user gifts",
         )
 
 
-@router.post(URL + "gifts/", dependencies=[Depends(get_current_user)])
-async def add_gift(request: Request, data: dict[str, str]) -> dict[str, str]:
+@router.get(URL + "gifts/user/{user_id}/export")
+async def export_gifts(
+    user_id: str, format: str = Query("ndjson", pattern="^(ndjson|csv)$")
+):
+    if await db.get_user_by_id(user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
+    logger.info("Exporting gifts of user {} as {}", user_id, format)
+
+    def fetch_page(batch_size, cursor):
+        return db.get_gifts_page(batch_size, cursor, user_id)
+
+    if format == "csv":
+        response = csv_response(fetch_page, "id", EXPORT_FIELDS)
+    else:
+        response = ndjson_response(fetch_page, "id", EXPORT_FIELDS)
+    response.headers["Content-Disposition"] = (
+        f'attachment; filename="wishlist-{user_id}.{format}"'
+    )
+    return response
+
+
+@router.post(URL + "gifts/import")
+async def import_gifts(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: dict = Depends(get_current_user),
+) -> dict:
+    """Import an export into the caller's wishlist without re-parsing links.
+
+    The body is read line by line and written in transactions of
+    STREAM_BATCH_SIZE gifts. Invalid records are skipped and reported.
+    """
+    user_id = current_user["user"]["user_id"]
+    imported = skipped = 0
+    errors = []
+    batch = []
+    try:
+        logger.info("Importing {} gifts for user {}", format, user_id)
+        lines = iter_lines(request.stream(), IMPORT_MAX_LINE_BYTES)
+        async for line_no, gift, error in iter_import_gifts(lines, format, user_id):
+            if error is not None:
+                skipped += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append(f"line {line_no}: {error}")
+                continue
+            batch.append(gift)
+            if len(batch) >= STREAM_BATCH_SIZE:
+                await db.add_gifts(batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            await db.add_gifts(batch)
+            imported += len(batch)
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.warning("Import for user {} stopped: {}", user_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{e}; {imported} gifts were imported before the error",
+        )
+    except Exception as e:
+        logger.error("Import for user {} failed: {}", user_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to import gifts",
+        )
+
+    logger.success(
+        "Imported {} gifts for user {}, skipped {}", imported, user_id, skipped
+    )
+    return {"imported": imported, "skipped": skipped, "errors": errors}
+
+
+@router.post(URL + "gifts/")
+async def add_gift(
+    data: dict[str, str], current_user: dict = Depends(get_current_user)
+) -> dict[str, str]:
     try:
         logger.info("Starting gift addition process")
 
@@ -103,32 +335,58 @@ async def add_gift(request: Request, data: dict[str, str]) -> dict[str, str]:
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Link is required"
             )
 
-        token = request.headers.get("Authorization")
-        if not token:
-            logger.warning("Unauthorized gift addition attempt")
+        if not is_supported_link(data["link"]):
+            logger.warning("Attempt to add gift with unsupported link")
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authorization token missing",
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported link"
             )
 
-        current_user = await get_current_user(token.replace("Bearer ", ""))
-
-        if "ozon.ru" in data["link"]:
-            try:
-                gift_id = str(uuid4())
-                logger.info(f"Parsing OZON link: {data['link']}")
-                task = parse_ozon_task(
-                    data["link"], current_user["user"]["user_id"], gift_id
-                )
-                return {"task_id": task.id, "gift_id": gift_id, "status": "processing"}
-                # new_gift = await parse_url_ozon(data["link"])
-                logger.info("OZON parsing task is started.")
-            except Exception as e:
-                logger.error(f"Failed to queue parsing task: {str(e)}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to start parsing process",
+        try:
+            gift_id = str(uuid4())
+            cache_key = normalize_link(data["link"])
+            cached = await db.get_cached_parse(cache_key)
+            if cached:
+                await db.add_gift(
+                    {
+                        "id": gift_id,
+                        "user_id": current_user["user"]["user_id"],
+                        "is_reserved": False,
+                        "reserve_owner": "",
+                        "link": data["link"],
+                        **cached,
+                    }
                 )
+                logger.success("Gift added from parse cache: {}", gift_id)
+                return {"task_id": "", "gift_id": gift_id, "status": "success"}
+
+            # Concurrent requests for the same product share one parse; the
+            # task creates a gift for each of them.
+            task = parse_gift_task.s(data["link"])
+            task_id = await db.join_inflight_parse(
+                cache_key,
+                gift_id,
+                current_user["user"]["user_id"],
+                data["link"],
+                task.id,
+                time.time() - PARSE_INFLIGHT_TTL_SECONDS,
+            )
+            if task_id == task.id:
+                logger.info("Parsing link: {}", data["link"])
+                try:
+                    huey.enqueue(task)
+                except Exception:
+                    # Requests that already joined would wait on it forever.
+                    await db.abandon_inflight_parse(cache_key, task.id)
+                    raise
+            else:
+                logger.info("Joined in-flight parse {} for {}", task_id, cache_key)
+            return {"task_id": task_id, "gift_id": gift_id, "status": "processing"}
+        except Exception as e:
+            logger.error("Failed to queue parsing task: {}", e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to start parsing process",
+            )
 
         # try:
         #     new_gift = {
@@ -163,81 +421,292 @@ async def add_gift(request: Request, data: dict[str, str]) -> dict[str, str]:
     except HTTPException:
         raise
     except Exception as e:
-        logger.critical(f"Unexpected error in add_gift: {str(e)}")
+        logger.critical("Unexpected error in add_gift: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred",
         )
 
 
-@router.put(URL + "gifts/{id}")
-async def update_gift(id: str, updated_gift: Gift) -> dict:
-    try:
-        logger.info(f"Request to update gift: {id}")
+@router.post(URL + "gifts/batch")
+async def add_gifts_batch(
+    data: dict[str, list[str]], current_user: dict = Depends(get_current_user)
+) -> dict:
+    links = data.get("links") or []
+    if not links:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Links are required"
+        )
+    if len(links) > BATCH_MAX_LINKS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BATCH_MAX_LINKS} links per batch",
+        )
 
-        existing_gift = db.get_gift_by_id(id)
-        if not existing_gift:
-            logger.warning(f"Update failed - gift not found: {id}")
+    try:
+        user_id = current_user["user"]["user_id"]
+        batch_id = str(uuid4())
+        logger.info("Starting batch {} with {} links", batch_id, len(links))
+
+        unique_links = {}
+        skipped = []
+        for link in links:
+            if not is_supported_link(link):
+                skipped.append(link)
+                continue
+            unique_links.setdefault(normalize_link(link), link)
+
+        if not unique_links:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Gift not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No supported links in batch",
             )
 
+        items = []
+        for cache_key, link in unique_links.items():
+            item = {"gift_id": str(uuid4()), "link": link}
+            cached = await db.get_cached_parse(cache_key)
+            if cached:
+                item.update(status="done", **cached)
+            items.append(item)
+
+        await db.create_batch(batch_id, user_id, items)
+        queued = [item for item in items if "status" not in item]
+        if queued:
+            parse_batch_item_task.map(
+                [(batch_id, item["gift_id"], item["link"]) for item in queued]
+            )
+        else:
+            await db.flush_batch(batch_id)
+
+        logger.success(
+            "Batch {}: {} of {} links queued", batch_id, len(queued), len(items)
+        )
+        return {
+            "batch_id": batch_id,
+            "total": len(items),
+            "queued": len(queued),
+            "skipped": skipped,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to start batch: {}", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start batch",
+        )
+
+
+@router.get(URL + "gifts/batch/{batch_id}")
+async def get_gifts_batch(
+    batch_id: str, current_user: dict = Depends(get_current_user)
+) -> dict:
+    batch = await db.get_batch(batch_id)
+    if not batch or batch["user_id"] != current_user["user"]["user_id"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found"
+        )
+    return batch
+
+
+@router.put(URL + "gifts/{id}")
+async def update_gift(id: str, updated_gift: Gift) -> dict:
+    try:
+        logger.info("Request to update gift: {}", id)
+
         try:
-            db.update_gift(id, updated_gift.dict())
-            logger.success(f"Gift updated successfully: {id}")
-            return {"message": "Gift updated successfully."}
+            updated = await db.update_gift(id, updated_gift.dict())
         except Exception as e:
-            logger.error(f"Update failed for gift {id}: {str(e)}")
+            logger.error("Update failed for gift {}: {}", id, e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to update gift",
             )
+
+        if not updated:
+            logger.warning("Update failed - gift not found: {}", id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Gift not found"
+            )
+
+        logger.success("Gift updated successfully: {}", id)
+        return {"message": "Gift updated successfully."}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error updating gift {id}: {str(e)}")
+        logger.error("Unexpected error updating gift {}: {}", id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred",
         )
 
 
-@router.delete(URL + "gifts/{id}")
-async def delete_gift(id: str) -> dict:
+@router.patch(URL + "gifts/{id}")
+async def patch_gift(id: str, patch: GiftPatch) -> dict:
     try:
-        logger.info(f"Request to delete gift: {id}")
+        logger.info("Request to patch gift: {}", id)
+        updated = await db.patch_gift(id, patch.dict(exclude_unset=True))
+    except Exception as e:
+        logger.error("Patch failed for gift {}: {}", id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update gift",
+        )
 
-        existing_gift = db.get_gift_by_id(id)
-        if not existing_gift:
-            logger.warning(f"Delete failed - gift not found: {id}")
+    if not updated:
+        logger.warning("Patch failed - gift not found: {}", id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Gift not found"
+        )
+
+    logger.success("Gift patched successfully: {}", id)
+    return {"message": "Gift updated successfully."}
+
+
+@router.patch(URL + "gifts/{id}/reserve")
+async def reserve_gift(id: str, reservation: Reservation) -> dict:
+    try:
+        logger.info("Request to reserve gift: {}", id)
+        reserved = await db.reserve_gift(id, reservation.reserve_owner)
+        if not reserved:
+            exists = await db.get_gift_by_id(id) is not None
+    except Exception as e:
+        logger.error("Reserve failed for gift {}: {}", id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to reserve gift",
+        )
+
+    if not reserved:
+        if not exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Gift not found"
             )
+        logger.info("Gift already reserved: {}", id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Gift is already reserved"
+        )
+
+    logger.success("Gift reserved successfully: {}", id)
+    return {"message": "Gift reserved successfully."}
+
+
+@router.patch(URL + "gifts/{id}/unreserve")
+async def unreserve_gift(id: str, reservation: Reservation) -> dict:
+    try:
+        logger.info("Request to unreserve gift: {}", id)
+        released = await db.unreserve_gift(id, reservation.reserve_owner)
+    except Exception as e:
+        logger.error("Unreserve failed for gift {}: {}", id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to unreserve gift",
+        )
+
+    if not released:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Gift is not reserved by this owner",
+        )
+
+    logger.success("Gift unreserved successfully: {}", id)
+    return {"message": "Gift unreserved successfully."}
+
+
+@router.delete(URL + "gifts/{id}")
+async def delete_gift(id: str) -> dict:
+    try:
+        logger.info("Request to delete gift: {}", id)
 
         try:
-            db.delete_gift(id)
-            logger.success(f"Gift deleted successfully: {id}")
-            return {"message": f"Gift {id} deleted successfully."}
+            deleted = await db.delete_gift(id)
         except Exception as e:
-            logger.error(f"Delete failed for gift {id}: {str(e)}")
+            logger.error("Delete failed for gift {}: {}", id, e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to delete gift",
             )
+
+        if not deleted:
+            logger.warning("Delete failed - gift not found: {}", id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Gift not found"
+            )
+
+        logger.success("Gift deleted successfully: {}", id)
+        return {"message": f"Gift {id} deleted successfully."}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error deleting gift {id}: {str(e)}")
+        logger.error("Unexpected error deleting gift {}: {}", id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred",
         )
 
 
+@router.get(URL + "gifts/parse-cache/stats")
+async def get_parse_cache_stats() -> dict[str, int]:
+    return await db.get_parse_cache_stats()
+
+
 @router.get(URL + "gifts/status/{id}")
 async def check_status(id: str):
-    logger.info(f"Try to get gift with id: {id}")
+    logger.debug("Try to get gift with id: {}", id)
+
+    gift = await db.get_gift_by_id(id)
+    gift_status = "success" if gift else "processing"
+    logger.debug("Gift {} status: {}", id, gift_status)
+    return {"status": gift_status}
+
+
+async def _read_task_status(task_id: str) -> dict | None:
+    return await asyncio.to_thread(get_task_status, task_id)
+
+
+@router.get(URL + "gifts/tasks/{task_id}")
+async def get_parse_task_status(
+    task_id: str, wait: float = Query(0, ge=0, le=TASK_STATUS_MAX_WAIT_SECONDS)
+) -> dict:
+    """Status of a parse task. With `wait`, long-poll until it finishes."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        task = await _read_task_status(task_id)
+        if task is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+            )
+        if task["status"] in TERMINAL_STATUSES or loop.time() >= deadline:
+            return task
+        await asyncio.sleep(TASK_STATUS_POLL_SECONDS)
+
+
+@router.get(URL + "gifts/tasks/{task_id}/events")
+async def stream_parse_task_status(task_id: str):
+    """Server-Sent Events: one event per status change, closed when finished."""
+    if await _read_task_status(task_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+        )
 
-    gift = db.get_gift_by_id(id)
-    logger.info(f"Gift status: {gift}")
-    return {"status": "success" if gift else "processing"}
+    async def events():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + TASK_STATUS_MAX_WAIT_SECONDS
+        last_status = None
+        while loop.time() < deadline:
+            task = await _read_task_status(task_id)
+            if task and task["status"] != last_status:
+                last_status = task["status"]
+                yield f"event: status\ndata: {json.dumps(task, default=str)}\n\n"
+                if last_status in TERMINAL_STATUSES:
+                    return
+            await asyncio.sleep(TASK_STATUS_POLL_SECONDS)
+        yield "event: timeout\ndata: {}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,30 @@
+import os
+from dotenv import load_dotenv
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse
+
+from utils.thumbnails import thumbnail_path
+
+load_dotenv()
+router = APIRouter()
+
+PRODUCTION = bool(int(os.getenv("PRODUCTION")))
+URL = "/api/" if PRODUCTION else "/"
+
+# Thumbnail names are content addresses, so a name never changes its bytes.
+THUMBNAIL_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get(URL + "thumbnails/{name}")
+async def get_thumbnail(name: str) -> FileResponse:
+    path = thumbnail_path(name)
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Thumbnail not found"
+        )
+
+    return FileResponse(
+        path,
+        media_type="image/webp" if name.endswith(".webp") else "image/jpeg",
+        headers={"Cache-Control": THUMBNAIL_CACHE_CONTROL},
+    )
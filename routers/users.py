@@ -1,13 +1,21 @@
 import os
 import shortuuid
-from fastapi import APIRouter, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, status
 from datetime import timedelta
 from dotenv import load_dotenv
 
-from utils.auth import get_password_hash, verify_password, create_access_token
+from utils.auth import (
+    get_password_hash,
+    verify_password,
+    create_access_token,
+    invalidate_user,
+)
 from . import db, logger
-from models.User import User
-from utils.config import ACCESS_TOKEN_EXPIRE_MINUTES
+from models.User import USER_FIELDS, User, UsersPage
+from utils.config import ACCESS_TOKEN_EXPIRE_MINUTES, MAX_PAGE_SIZE
+from utils.serialization import FastJSONResponse, parse_fields, project
+from utils.streaming import ndjson_response
 
 load_dotenv()
 router = APIRouter()
@@ -17,14 +25,34 @@ URL = "/api/" if PRODUCTION else "/"
 
 
 @router.get(URL + "users/")
-async def get_users() -> dict[str, list[User]]:
+async def get_users(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = None,
+) -> UsersPage:
+    selected = parse_fields(fields, USER_FIELDS)
     try:
         logger.info("Attempting to fetch all users")
-        users = db.get_all_users()
-        logger.success(f"Successfully fetched {len(users)} users")
-        return {"users": users}
+        if stream:
+            return ndjson_response(db.get_users_page, "user_id", selected)
+
+        if limit is not None or after is not None:
+            limit = limit or MAX_PAGE_SIZE
+            users = await db.get_users_page(limit, after)
+            logger.success("Successfully fetched page of {} users", len(users))
+            return FastJSONResponse(
+                {
+                    "users": project(users, selected),
+                    "next": users[-1]["user_id"] if len(users) == limit else None,
+                }
+            )
+
+        users = await db.get_all_users()
+        logger.success("Successfully fetched {} users", len(users))
+        return FastJSONResponse({"users": project(users, selected), "next": None})
     except Exception as e:
-        logger.error(f"Failed to fetch users: {str(e)}")
+        logger.error("Failed to fetch users: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch users",
@@ -34,21 +62,21 @@ async def get_users() -> dict[str, list[User]]:
 @router.get(URL + "users/{user_id}")
 async def get_user_by_id(user_id: str) -> dict[str, User]:
     try:
-        logger.info(f"Attempting to fetch user with ID: {user_id}")
-        user = db.get_user_by_id(user_id)
+        logger.info("Attempting to fetch user with ID: {}", user_id)
+        user = await db.get_user_by_id(user_id)
 
         if not user:
-            logger.warning(f"User not found with ID: {user_id}")
+            logger.warning("User not found with ID: {}", user_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
 
-        logger.success(f"Successfully fetched user: {user['username']}")
+        logger.success("Successfully fetched user: {}", user["username"])
         return {"user": user}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to fetch user {user_id}: {str(e)}")
+        logger.error("Failed to fetch user {}: {}", user_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch user",
@@ -58,7 +86,7 @@ async def get_user_by_id(user_id: str) -> dict[str, User]:
 @router.post(URL + "register")
 async def register(user: dict) -> dict[str, str]:
     try:
-        logger.info(f"Attempting to register new user: {user.get('username')}")
+        logger.info("Attempting to register new user: {}", user.get("username"))
 
         if not user.get("username") or not user.get("password"):
             logger.warning("Registration attempt with missing username or password")
@@ -67,9 +95,9 @@ async def register(user: dict) -> dict[str, str]:
                 detail="Username and password are required",
             )
 
-        existing_user = db.get_user_by_username(user["username"])
+        existing_user = await db.get_user_by_username(user["username"])
         if existing_user:
-            logger.warning(f"Username already exists: {user['username']}")
+            logger.warning("Username already exists: {}", user["username"])
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Username already registered",
@@ -78,15 +106,16 @@ async def register(user: dict) -> dict[str, str]:
         new_user = {
             "user_id": str(shortuuid.uuid(name=user["username"])),
             "username": user["username"],
-            "password": get_password_hash(user["password"]),
+            "password": await get_password_hash(user["password"]),
         }
-        db.create_user(new_user)
-        logger.success(f"User registered successfully: {user['username']}")
+        await db.create_user(new_user)
+        invalidate_user(new_user["username"])
+        logger.success("User registered successfully: {}", user["username"])
         return {"message": "User registered successfully."}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to register user {user.get('username')}: {str(e)}")
+        logger.error("Failed to register user {}: {}", user.get("username"), e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to register user",
@@ -96,7 +125,7 @@ async def register(user: dict) -> dict[str, str]:
 @router.post(URL + "login")
 async def login(credentials: dict) -> dict[str, str]:
     try:
-        logger.info(f"Login attempt for username: {credentials.get('username')}")
+        logger.info("Login attempt for username: {}", credentials.get("username"))
 
         if not credentials.get("username") or not credentials.get("password"):
             logger.warning("Login attempt with missing username or password")
@@ -105,18 +134,18 @@ async def login(credentials: dict) -> dict[str, str]:
                 detail="Username and password are required",
             )
 
-        user = db.get_user_by_username(credentials["username"])
+        user = await db.get_user_by_username(credentials["username"])
         if not user:
-            logger.warning(f"Login failed - user not found: {credentials['username']}")
+            logger.warning("Login failed - user not found: {}", credentials["username"])
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        if not verify_password(credentials["password"], user["password"]):
+        if not await verify_password(credentials["password"], user["password"]):
             logger.warning(
-                f"Login failed - invalid password for user: {credentials['username']}"
+                "Login failed - invalid password for user: {}", credentials["username"]
             )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -128,7 +157,7 @@ async def login(credentials: dict) -> dict[str, str]:
             data={"sub": credentials["username"]},
             expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
         )
-        logger.success(f"User logged in successfully: {credentials['username']}")
+        logger.success("User logged in successfully: {}", credentials["username"])
         return {
             "access_token": access_token,
             "token_type": "bearer",
@@ -137,7 +166,7 @@ async def login(credentials: dict) -> dict[str, str]:
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Login failed for {credentials.get('username')}: {str(e)}")
+        logger.error("Login failed for {}: {}", credentials.get("username"), e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Login failed"
         )
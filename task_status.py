@@ -0,0 +1,91 @@
+import time
+
+from huey import crontab, signals
+from huey.api import PeriodicTask
+
+from huey_config import huey
+from utils import logger
+from utils.config import PRIORITY_BACKGROUND, TASK_STATUS_TTL_SECONDS
+
+QUEUED = "queued"
+RUNNING = "running"
+RETRYING = "retrying"
+DONE = "done"
+FAILED = "failed"
+CANCELED = "canceled"
+TERMINAL_STATUSES = {DONE, FAILED, CANCELED}
+
+SIGNAL_STATUSES = {
+    signals.SIGNAL_ENQUEUED: QUEUED,
+    signals.SIGNAL_SCHEDULED: QUEUED,
+    signals.SIGNAL_EXECUTING: RUNNING,
+    signals.SIGNAL_RETRYING: RETRYING,
+    signals.SIGNAL_COMPLETE: DONE,
+    signals.SIGNAL_ERROR: FAILED,
+    signals.SIGNAL_EXPIRED: FAILED,
+    signals.SIGNAL_CANCELED: CANCELED,
+    signals.SIGNAL_REVOKED: CANCELED,
+}
+
+
+def status_key(task_id: str) -> str:
+    return f"task-status:{task_id}"
+
+
+@huey.signal()
+def record_task_status(signal, task, *args):
+    """Mirror each task's lifecycle into the huey key-value store.
+
+    ENQUEUED fires in the API process and the rest in the consumer, so both
+    must import this module. On retries SIGNAL_ERROR is followed by
+    SIGNAL_RETRYING, so the last write wins and the task reads as retrying.
+    Periodic tasks are never polled, so their runs are not recorded.
+    """
+    status = SIGNAL_STATUSES.get(signal)
+    if status is None or isinstance(task, PeriodicTask):
+        return
+    error = str(args[0]) if signal == signals.SIGNAL_ERROR and args else None
+    huey.put(
+        status_key(task.id),
+        {"status": status, "error": error, "updated_at": time.time()},
+    )
+
+
+def get_task_status(task_id: str) -> dict | None:
+    """Return {"status", "error", "result"} for a task, or None if unknown."""
+    state = huey.get(status_key(task_id), peek=True)
+    if state is None:
+        return None
+
+    state.pop("updated_at", None)
+    state["result"] = None
+    if state["status"] == DONE:
+        try:
+            state["result"] = huey.result(task_id, preserve=True)
+        except Exception as e:
+            state["error"] = str(e)
+    return state
+
+
+@huey.periodic_task(crontab(minute="0"), priority=PRIORITY_BACKGROUND)
+def prune_task_status():
+    """Drop statuses and results of tasks untouched for TASK_STATUS_TTL_SECONDS.
+
+    Results are read with preserve=True so clients can poll repeatedly; this
+    is what keeps them from piling up in the huey database.
+    """
+    prefix = status_key("")
+    stale_before = time.time() - TASK_STATUS_TTL_SECONDS
+    removed = 0
+    for key, value in huey.storage.result_items().items():
+        if not key.startswith(prefix):
+            continue
+        state = huey.serializer.deserialize(value)
+        if state.get("updated_at", 0) >= stale_before:
+            continue
+        huey.storage.pop_data(key)
+        huey.storage.pop_data(key[len(prefix):])
+        removed += 1
+
+    if removed:
+        logger.info("Pruned {} finished task statuses", removed)
@@ -1,30 +1,218 @@
+import sys
+import threading
+import time
+from huey import crontab, signals
+
 from huey_config import huey
 from routers import logger
-from utils.parsers import parse_url_ozon
+import task_status  # noqa: F401  registers the task status signal handler
+from utils.config import (
+    PARSE_RETRIES,
+    PARSE_RETRY_DELAY_SECONDS,
+    PARSE_TIMEOUT_SECONDS,
+    PRICE_REFRESH_BATCH_SIZE,
+    PRICE_REFRESH_DELAY_SECONDS,
+    PRICE_REFRESH_EVERY_MINUTES,
+    PRICE_REFRESH_MAX_AGE_SECONDS,
+    PRIORITY_BACKGROUND,
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+)
+from utils.links import normalize_link
+from utils.metrics import Counter, Histogram, registry
 from utils.sql_api import DB
 
-@huey.task()
-def parse_ozon_task(link: str, user_id: str, gift_id: str):
-    try:
-        logger.info(f"Starting OZON parsing for {link}")
+# The parser stack (selenium, seleniumbase, Pillow) is only imported by the
+# consumer, on the first task that needs it, so the API process stays lean.
+
+db = DB()
+
+# Snapshot of the consumer's metrics registry, merged into the API's /metrics.
+WORKER_METRICS_KEY = "metrics:worker"
+
+task_duration = Histogram(
+    "gifts_task_duration_seconds", "Duration of huey task executions.", ["task"]
+)
+task_failures = Counter(
+    "gifts_task_failures", "Failed huey task executions.", ["task"]
+)
+parse_timeouts = Counter("gifts_parse_timeouts", "Parses abandoned after the timeout.")
+_task_started: dict[str, float] = {}
+
+
+@huey.on_startup()
+def migrate_schema():
+    db.create_tables()
+
+
+@huey.on_shutdown()
+def close_browser_pool():
+    if "utils.browser_pool" in sys.modules:
+        sys.modules["utils.browser_pool"].browser_pool.close()
+
+
+def parse_url(link: str) -> dict:
+    from utils.parsers import parse_url
+
+    return parse_url(link)
+
+
+def make_thumbnail(photo_url: str | None) -> str | None:
+    from utils.thumbnails import evict_thumbnails, make_thumbnail
+
+    name = make_thumbnail(photo_url)
+    if name is None:
+        return None
+    evicted = evict_thumbnails()
+    if evicted:
+        db.clear_thumbnails(evicted)
+    return None if name in evicted else name
+
+
+@huey.signal(signals.SIGNAL_EXECUTING, signals.SIGNAL_COMPLETE, signals.SIGNAL_ERROR)
+def record_task_metrics(signal, task, *args):
+    if signal == signals.SIGNAL_EXECUTING:
+        _task_started[task.id] = time.perf_counter()
+        return
+
+    started = _task_started.pop(task.id, None)
+    if started is not None:
+        task_duration.observe(time.perf_counter() - started, task=task.name)
+    if signal == signals.SIGNAL_ERROR:
+        task_failures.inc(task=task.name)
+    huey.put(WORKER_METRICS_KEY, registry.collect())
+
+
+def call_with_timeout(func, timeout: float, *args):
+    """Run `func(*args)` in a helper thread and give up after `timeout` seconds.
 
-        parsed_data = parse_url_ozon(link)
+    On timeout the browser session held by the helper thread is killed, so a
+    hung page load can not pin a browser or a worker for good.
+    """
+    outcome = {}
 
-        gift_data = {
-            "id": gift_id,
-            "user_id": user_id,
-            "is_reserved": False,
-            "reserve_owner": "",
-            "link": link,
-            **parsed_data,
-        }
+    def run():
+        try:
+            outcome["result"] = func(*args)
+        except BaseException as e:
+            outcome["error"] = e
 
-        db = DB()
-        
-        db.add_gift(gift_data)
-        logger.success(f"Successfully saved gift {gift_id}")
-        return {"status": "success", "gift_id": gift_id}
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        parse_timeouts.inc()
+        from utils.browser_pool import browser_pool
 
+        browser_pool.abort(thread.ident)
+        raise TimeoutError(f"Gave up after {timeout:.0f}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def backoff(task):
+    """Double the delay before each retry: base, 2 * base, 4 * base, ..."""
+    attempt = PARSE_RETRIES - task.retries
+    task.retry_delay = PARSE_RETRY_DELAY_SECONDS * 2**attempt
+
+
+def parse_link(db: DB, link: str) -> dict:
+    """Parse a product link, serving repeat links from the parse cache."""
+    cache_key = normalize_link(link)
+    parsed_data = db.get_cached_parse(cache_key)
+    if parsed_data is not None:
+        logger.info("Parse cache hit for {}", cache_key)
+        return parsed_data
+
+    parsed_data = call_with_timeout(parse_url, PARSE_TIMEOUT_SECONDS, link)
+    parsed_data["thumbnail"] = make_thumbnail(parsed_data["photo"])
+    if parsed_data["name"]:
+        db.set_cached_parse(cache_key, parsed_data)
+    return parsed_data
+
+
+@huey.task(
+    retries=PARSE_RETRIES,
+    retry_delay=PARSE_RETRY_DELAY_SECONDS,
+    priority=PRIORITY_INTERACTIVE,
+    context=True,
+)
+def parse_gift_task(link: str, task=None):
+    """Parse `link` once for every gift waiting on it in parse_inflight."""
+    key = normalize_link(link)
+    try:
+        logger.info("Starting parsing for {}", link)
+        parsed_data = parse_link(db, link)
+    except Exception as e:
+        if task.retries:
+            logger.warning("Parsing failed for {}, retrying: {}", link, e)
+            backoff(task)
+        else:
+            logger.error("Parsing failed for {}: {}", link, e)
+            db.abandon_inflight_parse(key, task.id)
+        raise
+
+    gift_ids = db.complete_inflight_parse(key, parsed_data)
+    logger.success("Saved {} gifts for {}", len(gift_ids), key)
+    return {"status": "success", "gift_ids": gift_ids}
+
+
+@huey.task(
+    retries=PARSE_RETRIES,
+    retry_delay=PARSE_RETRY_DELAY_SECONDS,
+    priority=PRIORITY_BATCH,
+    context=True,
+)
+def parse_batch_item_task(batch_id: str, gift_id: str, link: str, task=None):
+    try:
+        logger.info("Starting batch {} parsing for {}", batch_id, link)
+        parsed_data = parse_link(db, link)
+        written = db.complete_batch_item(batch_id, gift_id, parsed=parsed_data)
     except Exception as e:
-        logger.error(f"OZON parsing failed: {str(e)}")
-        return {"status": "error", "message": str(e)}
+        if task.retries:
+            logger.warning(
+                "Batch {} parsing failed for {}, retrying: {}", batch_id, link, e
+            )
+            backoff(task)
+            raise
+        logger.error("Batch {} parsing failed for {}: {}", batch_id, link, e)
+        written = db.complete_batch_item(batch_id, gift_id, error=str(e))
+
+    if written:
+        logger.success("Batch {}: saved {} gifts", batch_id, written)
+    return {"status": "success", "gift_id": gift_id}
+
+
+@huey.periodic_task(
+    crontab(minute=f"*/{PRICE_REFRESH_EVERY_MINUTES}"), priority=PRIORITY_BACKGROUND
+)
+def refresh_prices_task():
+    """Re-parse the stalest gifts, unreserved first, and record price changes.
+
+    Runs one small batch per tick, sleeps between parses and stops as soon as
+    interactive parses are waiting in the queue.
+    """
+    gifts = db.get_stale_gifts(
+        PRICE_REFRESH_BATCH_SIZE, time.time() - PRICE_REFRESH_MAX_AGE_SECONDS
+    )
+    checked = changed = 0
+    for gift in gifts:
+        if huey.pending_count() > 0:
+            logger.info("Parses are waiting, pausing price refresh")
+            break
+
+        cost = gift["cost"]
+        try:
+            cost = parse_link(db, gift["link"])["cost"] or gift["cost"]
+        except Exception as e:
+            logger.warning("Price refresh failed for {}: {}", gift["id"], e)
+
+        # Failed links are stamped too, so they wait a full interval instead
+        # of blocking the head of the queue.
+        changed += db.record_price_check(gift["id"], cost)
+        checked += 1
+        time.sleep(PRICE_REFRESH_DELAY_SECONDS)
+
+    if checked:
+        logger.info("Price refresh checked {} gifts, {} changed", checked, changed)
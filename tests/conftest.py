@@ -0,0 +1,100 @@
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+# DATABASE_URL and TASKBASE_URL are read on import, so point them away from
+# any real databases first; tests that use the DB get their own file below.
+os.environ["DATABASE_URL"] = os.path.join(tempfile.gettempdir(), "get_gifts_test.db")
+os.environ["TASKBASE_URL"] = os.path.join(
+    tempfile.gettempdir(), "get_gifts_test_tasks.db"
+)
+os.environ["LOG_FILE"] = os.devnull
+os.environ["PRODUCTION"] = "0"
+os.environ.setdefault("KEY", "test-secret")
+
+from utils import sql_api  # noqa: E402
+
+
+def make_gift(gift_id: str, user_id: str = "user-1") -> dict:
+    return {
+        "id": gift_id,
+        "name": f"Gift {gift_id}",
+        "cost": 100.0,
+        "link": f"https://shop.example.com/item?id={gift_id}",
+        "photo": None,
+        "is_reserved": False,
+        "reserve_owner": "",
+        "user_id": user_id,
+    }
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch) -> str:
+    path = str(tmp_path / "gifts.db")
+    monkeypatch.setattr(sql_api, "DATABASE_URL", path)
+    return path
+
+
+@pytest.fixture
+def db(database_url):
+    db = sql_api.DB()
+    db.create_tables()
+    yield db
+    db.close()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    """Stands in for `time` in sql_api; advance it with `clock.now += ...`."""
+    clock = Clock()
+    monkeypatch.setattr(sql_api, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    """The gifts API on the test database, signed in as `user-1`."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from routers import gifts
+    from utils import auth
+
+    async_db = sql_api.AsyncDB(max_workers=1)
+    monkeypatch.setattr(gifts, "db", async_db)
+    monkeypatch.setattr(auth, "db", async_db)
+    db.create_user({"user_id": "user-1", "username": "alice", "password": "x"})
+
+    app = FastAPI()
+    app.include_router(gifts.router)
+    app.dependency_overrides[auth.get_current_user] = lambda: {
+        "user": {"user_id": "user-1", "username": "alice"}
+    }
+    with TestClient(app) as client:
+        yield client
+    async_db.close()
+
+
+def query_plan(connection: sqlite3.Connection, call) -> str:
+    """EXPLAIN QUERY PLAN of the SELECT that `call()` runs on `connection`."""
+    statements = []
+    connection.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        connection.set_trace_callback(None)
+
+    selects = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+    assert selects, f"no SELECT among {statements}"
+    rows = connection.execute(f"EXPLAIN QUERY PLAN {selects[-1]}").fetchall()
+    return "\n".join(row[-1] for row in rows)
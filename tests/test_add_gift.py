@@ -0,0 +1,50 @@
+from routers import gifts
+from utils import sql_api
+
+
+def inflight(db) -> list[tuple]:
+    rows = db.connection.execute(
+        "SELECT gift_id, task_id FROM parse_inflight ORDER BY gift_id"
+    )
+    return [tuple(row) for row in rows]
+
+
+def test_failed_enqueue_drops_the_leader_and_everyone_who_joined(
+    client, db, monkeypatch
+):
+    link = "https://shop.example.com/item?id=1"
+
+    def enqueue(task):
+        # Another request joins between recording the leader and enqueueing.
+        db.join_inflight_parse(
+            "shop.example.com/item?id=1", "joiner", "user-2", link, "other", 0
+        )
+        raise RuntimeError("queue is down")
+
+    monkeypatch.setattr(gifts.huey, "enqueue", enqueue)
+
+    response = client.post("/gifts/", json={"link": link})
+
+    assert response.status_code == 500
+    assert inflight(db) == []
+
+
+def test_joiners_do_not_keep_a_stuck_parse_fresh(db, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sql_api.time, "time", lambda: now[0])
+    ttl = 900
+
+    def join(gift_id: str, task_id: str) -> str:
+        return db.join_inflight_parse(
+            "key", gift_id, "user-1", "link", task_id, now[0] - ttl
+        )
+
+    assert join("g1", "leader") == "leader"
+    now[0] = 1500.0
+    assert join("g2", "joiner") == "leader"
+    now[0] = 2000.0
+    assert join("g3", "fresh") == "fresh"
+    assert inflight(db) == [("g1", "leader"), ("g2", "leader"), ("g3", "fresh")]
+
+    db.abandon_inflight_parse("key", "leader")
+    assert inflight(db) == [("g3", "fresh")]
@@ -0,0 +1,89 @@
+def parsed(gift_id: str) -> dict:
+    return {"name": f"Gift {gift_id}", "cost": 100.0, "photo": None}
+
+
+def start_batch(db, count: int, batch_id: str = "b1") -> list[str]:
+    gift_ids = [f"g{number}" for number in range(1, count + 1)]
+    db.create_batch(
+        batch_id,
+        "user-1",
+        [
+            {"gift_id": gift_id, "link": f"https://shop.example.com/{gift_id}"}
+            for gift_id in gift_ids
+        ],
+    )
+    return gift_ids
+
+
+def saved(db) -> list[str]:
+    return sorted(gift["id"] for gift in db.get_gifts_by_user_id("user-1"))
+
+
+def test_pending_gifts_are_written_at_the_size_threshold(db, clock):
+    start_batch(db, 5)
+
+    def complete(gift_id: str) -> int:
+        return db.complete_batch_item(
+            "b1", gift_id, parsed=parsed(gift_id), flush_size=2, flush_seconds=60
+        )
+
+    assert complete("g1") == 0
+    assert complete("g2") == 2
+    assert saved(db) == ["g1", "g2"]
+    assert complete("g3") == 0
+    assert saved(db) == ["g1", "g2"]
+    assert not db.get_batch("b1")["completed"]
+
+
+def test_pending_gifts_are_written_at_the_time_threshold(db, clock):
+    start_batch(db, 3)
+
+    def complete(gift_id: str) -> int:
+        return db.complete_batch_item(
+            "b1", gift_id, parsed=parsed(gift_id), flush_size=10, flush_seconds=5
+        )
+
+    clock.now += 4
+    assert complete("g1") == 0
+    clock.now += 1
+    assert complete("g2") == 2
+    assert saved(db) == ["g1", "g2"]
+    # The clock restarts at each write.
+    clock.now += 4
+    db.complete_batch_item("b1", "g3", error="timeout", flush_size=10, flush_seconds=5)
+    assert saved(db) == ["g1", "g2"]
+
+
+def test_last_item_writes_the_rest_once(db, clock):
+    start_batch(db, 3)
+    options = {"flush_size": 10, "flush_seconds": 60}
+
+    assert db.complete_batch_item("b1", "g1", parsed=parsed("g1"), **options) == 0
+    assert db.complete_batch_item("b1", "g2", error="not found", **options) == 0
+    assert db.complete_batch_item("b1", "g3", parsed=parsed("g3"), **options) == 2
+
+    assert saved(db) == ["g1", "g3"]
+    batch = db.get_batch("b1")
+    assert (batch["completed"], batch["done"], batch["failed"]) == (True, 2, 1)
+    assert db.flush_batch("b1") == 0
+    assert saved(db) == ["g1", "g3"]
+
+
+def test_batch_parsed_from_cache_is_written_by_flush_batch(db, clock):
+    db.create_batch(
+        "b1",
+        "user-1",
+        [
+            {
+                "gift_id": "g1",
+                "link": "https://shop.example.com/g1",
+                "status": "done",
+                **parsed("g1"),
+            }
+        ],
+    )
+
+    assert db.flush_batch("b1") == 1
+    assert db.flush_batch("b1") == 0
+    assert saved(db) == ["g1"]
+    assert db.get_batch("b1")["completed"]
@@ -0,0 +1,27 @@
+import pytest
+
+from benchmarks.parsers import FIXTURES, allow_loopback, bench_fixture, serve_fixtures
+from utils.parsers.generic import parse_url_http
+
+
+@pytest.fixture
+def fixture_server():
+    server = serve_fixtures()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+
+def test_parser_benchmark_reaches_its_fixture_server(fixture_server):
+    with allow_loopback():
+        rows = bench_fixture(FIXTURES / "ozon_product.html", fixture_server, 1)
+
+    results = {label.split()[0]: result for label, result, _ in rows}
+    assert results["http"] is not None
+    assert results["http"] == results["extract"]
+
+
+def test_loopback_is_refused_again_outside_the_harness(fixture_server):
+    with allow_loopback():
+        pass
+
+    assert parse_url_http(fixture_server + "ozon_product.html") is None
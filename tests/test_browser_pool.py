@@ -0,0 +1,70 @@
+import pytest
+
+browser_pool = pytest.importorskip("utils.browser_pool")
+
+
+class OldChromeDriver:
+    """A driver whose Network.setBlockedURLs only takes plain `urls`."""
+
+    current_url = "about:blank"
+
+    def __init__(self):
+        self.blocked = None
+
+    def execute_cdp_cmd(self, command: str, params: dict):
+        if command == "Network.setBlockedURLs":
+            if "urlPatterns" in params:
+                raise RuntimeError("Invalid parameters: urls: array expected")
+            self.blocked = params["urls"]
+
+
+class FakeSB:
+    def __init__(self):
+        self.driver = OldChromeDriver()
+
+    def open(self, url: str):
+        self.url = url
+
+    def get_current_url(self) -> str:
+        return self.url
+
+    def execute_script(self, script: str) -> int:
+        return 0
+
+
+class FakeSession(browser_pool.BrowserSession):
+    def __init__(self):
+        self.sb = FakeSB()
+        self.pages = 0
+        self.blocking = False
+        self.exempts_allowed = True
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(browser_pool, "BrowserSession", FakeSession)
+    monkeypatch.setattr(browser_pool, "BROWSER_ALLOWED_URLS", ("*cdn.example*",))
+    monkeypatch.setattr(browser_pool, "BROWSER_BLOCKED_URLS", ("*.jpg", "*.woff2"))
+    monkeypatch.setattr(browser_pool, "BROWSER_BLOCK_BASELINE_EVERY", 0)
+    monkeypatch.setattr(browser_pool, "check_public_url", lambda url: None)
+    pool = browser_pool.BrowserPool(size=1)
+    yield pool
+    pool.close()
+
+
+def test_old_chrome_still_blocks_and_warns_once(pool, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(
+        browser_pool.logger, "warning", lambda message, *args: warnings.append(message)
+    )
+
+    for _ in range(3):
+        with pool.session() as sb:
+            pool.open("https://shop.example.com/item")
+            assert sb.driver.blocked == ["*.jpg", "*.woff2"]
+
+    assert len(warnings) == 1
+    assert "BROWSER_ALLOWED_URLS" in warnings[0]
@@ -0,0 +1,23 @@
+from conftest import make_gift
+
+
+def test_unchanged_wishlist_is_not_modified(client, db):
+    db.add_gift(make_gift("g1"))
+    first = client.get("/gifts/user/user-1")
+    etag = first.headers["ETag"]
+
+    cached = client.get("/gifts/user/user-1", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    db.add_gift(make_gift("g2"))
+    changed = client.get("/gifts/user/user-1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [gift["id"] for gift in changed.json()["gifts"]] == ["g1", "g2"]
+
+
+def test_unknown_user_is_not_found_even_with_matching_etag(client):
+    response = client.get("/gifts/user/nobody", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
@@ -0,0 +1,35 @@
+import pytest
+
+from conftest import make_gift
+
+
+def test_reserve_is_first_come_first_served(client, db):
+    db.add_gift(make_gift("g1"))
+
+    first = client.patch("/gifts/g1/reserve", json={"reserve_owner": "bob"})
+    second = client.patch("/gifts/g1/reserve", json={"reserve_owner": "eve"})
+
+    assert first.status_code == 200
+    assert second.status_code == 409
+    assert db.get_gift_by_id("g1")["reserve_owner"] == "bob"
+
+
+def test_patch_updates_only_given_fields(client, db):
+    db.add_gift(make_gift("g1"))
+
+    response = client.patch("/gifts/g1", json={"cost": 250, "photo": None})
+
+    assert response.status_code == 200
+    gift = db.get_gift_by_id("g1")
+    assert (gift["name"], gift["cost"], gift["photo"]) == ("Gift g1", 250, None)
+
+
+@pytest.mark.parametrize("field", ["name", "cost", "link", "is_reserved"])
+def test_patch_rejects_null_for_required_fields(client, db, field):
+    db.add_gift(make_gift("g1"))
+    before = db.get_gift_by_id("g1")
+
+    response = client.patch("/gifts/g1", json={field: None})
+
+    assert response.status_code == 422
+    assert db.get_gift_by_id("g1") == before
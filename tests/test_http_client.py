@@ -0,0 +1,57 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from utils import http_client
+from utils.http_client import BlockedAddressError, fetch
+from utils.links import is_supported_link
+
+
+class RedirectToMetadata(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(302)
+        self.send_header("Location", "http://169.254.169.254/latest/meta-data/")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = HTTPServer(("127.0.0.1", 0), RedirectToMetadata)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+
+@pytest.mark.parametrize(
+    "link",
+    [
+        "http://127.0.0.1/",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://10.0.0.5/admin",
+        "http://192.168.1.1/",
+        "http://[::1]/",
+        "http://localhost/",
+        "http://printer.local/",
+    ],
+)
+def test_non_public_hosts_are_not_supported(link):
+    assert not is_supported_link(link)
+
+
+def test_fetch_refuses_loopback(local_server):
+    with pytest.raises(BlockedAddressError):
+        fetch(local_server)
+
+
+def test_fetch_checks_redirect_targets(local_server, monkeypatch):
+    # Let the test server through; the redirect target must still be refused.
+    monkeypatch.setattr(
+        http_client, "is_public_address", lambda address: address == "127.0.0.1"
+    )
+
+    with pytest.raises(BlockedAddressError, match="169.254.169.254"):
+        fetch(local_server)
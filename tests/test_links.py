@@ -0,0 +1,24 @@
+from utils.links import normalize_link
+
+
+def test_marketplace_links_reduce_to_product_id():
+    assert normalize_link("https://www.ozon.ru/product/mug-123456/?utm_source=x") == (
+        "ozon:123456"
+    )
+    assert normalize_link("wildberries.ru/catalog/98765/detail.aspx?size=1") == (
+        "wb:98765"
+    )
+
+
+def test_generic_links_keep_the_query_that_selects_the_product():
+    first = normalize_link("https://shop.example.com/item?id=1")
+    second = normalize_link("https://shop.example.com/item?id=2")
+
+    assert first != second
+    assert first == "shop.example.com/item?id=1"
+
+
+def test_generic_links_drop_tracking_params_and_order():
+    assert normalize_link(
+        "https://www.shop.example.com/item/?utm_source=vk&b=2&gclid=x&a=1#reviews"
+    ) == normalize_link("shop.example.com/item?a=1&b=2")
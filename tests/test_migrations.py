@@ -0,0 +1,26 @@
+import sqlite3
+
+from conftest import query_plan
+from utils.migrations import LATEST_VERSION, get_schema_version, migrate
+
+
+def test_migrates_empty_database_to_latest(database_url):
+    connection = sqlite3.connect(database_url)
+    assert get_schema_version(connection) == 0
+
+    assert migrate(connection) == LATEST_VERSION
+    assert migrate(connection) == LATEST_VERSION
+    connection.close()
+
+
+def test_username_lookup_uses_unique_index(db):
+    plan = query_plan(db.connection, lambda: db.get_user_by_username("alice"))
+
+    assert "SEARCH users USING" in plan
+    assert "idx_users_username" in plan
+
+
+def test_gifts_by_owner_use_owner_index(db):
+    plan = query_plan(db.connection, lambda: db.get_gifts_by_user_id("user-1"))
+
+    assert "SEARCH gifts USING INDEX idx_gifts_user_id_id" in plan
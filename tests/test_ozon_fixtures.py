@@ -0,0 +1,166 @@
+import re
+from contextlib import contextmanager
+from html.parser import HTMLParser
+
+import pytest
+
+from benchmarks.parsers import FIXTURES, allow_loopback, serve_fixtures
+from utils.extract import extract_product
+
+ozon = pytest.importorskip("utils.parsers.ozon")
+
+MUG = {
+    "name": "Кружка керамическая 350 мл",
+    "photo": "https://cdn1.ozone.ru/s3/multimedia-1-x/wc1000/7000000001.jpg",
+    "cost": 1299.0,
+}
+PLAID = {
+    "name": "Плед флисовый 150×200",
+    "photo": "https://cdn1.ozone.ru/s3/multimedia-1-y/wc1000/7000000002.jpg",
+    "cost": 2450.0,
+}
+
+VOID_TAGS = {"meta", "img", "link", "br", "input"}
+COMPOUND_RE = re.compile(r'^(\w*)((?:\[[\w-]+\*?="[^"]*"\])*)$')
+ATTRIBUTE_RE = re.compile(r'\[([\w-]+)(\*?)="([^"]*)"\]')
+
+
+class Element:
+    def __init__(self, tag: str, attrs: dict, parent: "Element | None"):
+        self.tag, self.attrs, self.parent = tag, attrs, parent
+        self.text = ""
+
+
+class Page(HTMLParser):
+    """Just enough DOM to answer the Ozon parser's CSS selectors."""
+
+    def __init__(self, html: str):
+        super().__init__()
+        self.elements: list[Element] = []
+        self._open: list[Element] = []
+        self.feed(html)
+
+    def handle_starttag(self, tag, attrs):
+        parent = self._open[-1] if self._open else None
+        element = Element(tag, dict(attrs), parent)
+        self.elements.append(element)
+        if tag not in VOID_TAGS:
+            self._open.append(element)
+
+    def handle_endtag(self, tag):
+        if self._open and self._open[-1].tag == tag:
+            self._open.pop()
+
+    def handle_data(self, data):
+        for element in self._open:
+            element.text += data
+
+    def select(self, selectors: str) -> list[Element]:
+        return [
+            element
+            for selector in selectors.split(", ")
+            for element in self.elements
+            if _matches(element, selector.split())
+        ]
+
+
+def _matches_compound(element: Element, compound: str) -> bool:
+    tag, attributes = COMPOUND_RE.match(compound).groups()
+    if tag and element.tag != tag:
+        return False
+    for name, contains, value in ATTRIBUTE_RE.findall(attributes):
+        actual = element.attrs.get(name)
+        if actual is None or (value not in actual if contains else actual != value):
+            return False
+    return True
+
+
+def _matches(element: Element, compounds: list[str]) -> bool:
+    if not _matches_compound(element, compounds[-1]):
+        return False
+    ancestor = element.parent
+    for compound in reversed(compounds[:-1]):
+        while ancestor is not None and not _matches_compound(ancestor, compound):
+            ancestor = ancestor.parent
+        if ancestor is None:
+            return False
+        ancestor = ancestor.parent
+    return True
+
+
+class FakeBrowser:
+    """The seleniumbase calls parse_url_ozon_browser makes, over a fixture."""
+
+    def __init__(self):
+        self.page = None
+        self.opened = []
+
+    @contextmanager
+    def session(self):
+        yield self
+
+    def open(self, url: str):
+        self.opened.append(url)
+        self.page = Page((FIXTURES / url.rsplit("/", 1)[-1]).read_text("utf-8"))
+
+    def _first(self, selector: str) -> Element:
+        found = self.page.select(selector)
+        if not found:
+            raise LookupError(selector)
+        return found[0]
+
+    def is_element_present(self, selector: str) -> bool:
+        return bool(self.page.select(selector))
+
+    def wait_for_element_visible(self, selector: str, timeout=None):
+        return self._first(selector)
+
+    wait_for_element_present = find_element = wait_for_element_visible
+
+    def get_text(self, selector: str) -> str:
+        return self._first(selector).text.strip()
+
+    def get_attribute(self, selector: str, attribute: str, timeout=None):
+        return self._first(selector).attrs.get(attribute)
+
+    def click(self, selector: str):
+        self._first(selector)
+
+
+@pytest.fixture
+def fixture_url():
+    server = serve_fixtures()
+    with allow_loopback():
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+
+@pytest.fixture
+def browser(monkeypatch):
+    browser = FakeBrowser()
+    monkeypatch.setattr(ozon, "browser_pool", browser)
+    return browser
+
+
+def test_extract_reads_structured_data():
+    page = (FIXTURES / "ozon_product.html").read_text("utf-8")
+
+    assert extract_product(page) == MUG
+
+
+def test_extract_gives_up_on_dom_only_page():
+    page = (FIXTURES / "ozon_product_dom_only.html").read_text("utf-8")
+
+    assert extract_product(page) is None
+
+
+def test_ozon_parses_structured_page_over_http(fixture_url, browser):
+    assert ozon.parse_url_ozon(fixture_url + "ozon_product.html") == MUG
+    assert browser.opened == []
+
+
+def test_ozon_falls_back_to_browser_for_dom_only_page(fixture_url, browser):
+    url = fixture_url + "ozon_product_dom_only.html"
+
+    assert ozon.parse_url_ozon(url) == PLAID
+    assert browser.opened == [url]
@@ -0,0 +1,24 @@
+from conftest import make_gift
+
+
+def test_keyset_pages_cover_every_gift_once(db):
+    db.add_gifts([make_gift(f"g{i:02d}") for i in range(7)])
+
+    seen, after = [], None
+    while True:
+        page = db.get_gifts_page(3, after)
+        seen.extend(gift["id"] for gift in page)
+        if len(page) < 3:
+            break
+        after = page[-1]["id"]
+
+    assert seen == [f"g{i:02d}" for i in range(7)]
+
+
+def test_keyset_pages_filter_by_owner(db):
+    db.add_gifts(
+        [make_gift("a1"), make_gift("a2", "user-2"), make_gift("a3"), make_gift("a4")]
+    )
+
+    assert [g["id"] for g in db.get_gifts_page(2, user_id="user-1")] == ["a1", "a3"]
+    assert [g["id"] for g in db.get_gifts_page(2, "a3", "user-1")] == ["a4"]
@@ -0,0 +1,43 @@
+PARSED = {"name": "Кружка", "cost": 499.0, "photo": "https://img.example/1.jpg"}
+
+
+def test_fresh_entry_is_a_hit(db, clock):
+    db.set_cached_parse("ozon:1", PARSED)
+
+    assert db.get_cached_parse("ozon:1", ttl=60) == PARSED | {"thumbnail": None}
+    assert db.get_cached_parse("ozon:2", ttl=60) is None
+    assert db.get_parse_cache_stats() == {
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "entries": 1,
+    }
+
+
+def test_expired_entry_is_a_miss_and_is_dropped(db, clock):
+    db.set_cached_parse("ozon:1", PARSED)
+
+    clock.now += 60
+    assert db.get_cached_parse("ozon:1", ttl=60) is not None
+    clock.now += 1
+    assert db.get_cached_parse("ozon:1", ttl=60) is None
+
+    stats = db.get_parse_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 0)
+
+
+def test_least_recently_used_entry_is_evicted(db, clock):
+    db.set_cached_parse("ozon:1", PARSED, max_entries=2)
+    clock.now += 1
+    db.set_cached_parse("ozon:2", PARSED, max_entries=2)
+    clock.now += 1
+    # Reading ozon:1 makes ozon:2 the least recently used.
+    db.get_cached_parse("ozon:1", ttl=60)
+    clock.now += 1
+    db.set_cached_parse("ozon:3", PARSED, max_entries=2)
+
+    assert db.get_cached_parse("ozon:1", ttl=60) is not None
+    assert db.get_cached_parse("ozon:3", ttl=60) is not None
+    assert db.get_cached_parse("ozon:2", ttl=60) is None
+    stats = db.get_parse_cache_stats()
+    assert (stats["evictions"], stats["entries"]) == (1, 2)
@@ -0,0 +1,67 @@
+import pytest
+
+from conftest import make_gift
+from utils import sql_api
+
+
+@pytest.fixture
+def cached_db(db):
+    cached = sql_api.DB(read_cache_size=2)
+    yield cached
+    cached.close()
+
+
+def ids(gifts: list[dict]) -> list[str]:
+    return [gift["id"] for gift in gifts]
+
+
+def test_unchanged_reads_are_served_from_the_cache(db, cached_db):
+    db.add_gift(make_gift("g1"))
+
+    first = cached_db.get_gifts_by_user_id("user-1")
+
+    assert cached_db.get_gifts_by_user_id("user-1") is first
+
+
+def test_write_from_another_connection_invalidates(db, cached_db):
+    db.add_gift(make_gift("g1"))
+    assert ids(cached_db.get_gifts_by_user_id("user-1")) == ["g1"]
+
+    db.add_gift(make_gift("g2"))
+    db.patch_gift("g1", {"name": "Renamed"})
+
+    gifts = cached_db.get_gifts_by_user_id("user-1")
+    assert ids(gifts) == ["g1", "g2"]
+    assert gifts[0]["name"] == "Renamed"
+    assert cached_db.get_gift_by_id("g1")["name"] == "Renamed"
+
+
+def test_own_write_invalidates(cached_db):
+    cached_db.add_gift(make_gift("g1"))
+    assert cached_db.get_gift_by_id("g1")["is_reserved"] is False
+
+    assert cached_db.reserve_gift("g1", "bob")
+
+    assert cached_db.get_gift_by_id("g1")["is_reserved"] is True
+
+
+def test_other_wishlists_stay_cached_after_a_write(db, cached_db):
+    db.add_gifts([make_gift("g1"), make_gift("g2", "user-2")])
+    first = cached_db.get_gifts_by_user_id("user-1")
+
+    db.add_gift(make_gift("g3", "user-2"))
+
+    assert cached_db.get_gifts_by_user_id("user-1") is first
+    assert ids(cached_db.get_gifts_by_user_id("user-2")) == ["g2", "g3"]
+
+
+def test_entries_stay_within_the_bound(db, cached_db):
+    db.add_gifts([make_gift(f"g{i}") for i in range(5)])
+
+    for i in range(5):
+        assert cached_db.get_gift_by_id(f"g{i}")["id"] == f"g{i}"
+
+    entries = cached_db.read_cache._entries
+    assert len(entries) == 2
+    assert entries.get(("gift", "g0")) is None
+    assert entries.get(("gift", "g4")) is not None
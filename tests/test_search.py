@@ -0,0 +1,49 @@
+from conftest import make_gift
+
+
+def add(db, gift_id: str, name: str, cost: float):
+    db.add_gift(make_gift(gift_id) | {"name": name, "cost": cost})
+
+
+def search_all(client, **params) -> list[str]:
+    ids, after = [], None
+    while True:
+        query = params | {"limit": 2} | ({"after": after} if after else {})
+        page = client.get("/gifts/search", params=query).json()
+        ids.extend(gift["id"] for gift in page["gifts"])
+        after = page["next"]
+        if after is None:
+            return ids
+
+
+def test_text_search_matches_word_prefixes(client, db):
+    add(db, "g1", "Кружка керамическая", 500)
+    add(db, "g2", "Керамический чайник", 1500)
+    add(db, "g3", "Плед шерстяной", 2500)
+
+    assert sorted(search_all(client, q="керам")) == ["g1", "g2"]
+    assert search_all(client, q="плед") == ["g3"]
+
+
+def test_renamed_gift_is_found_by_its_new_name(client, db):
+    add(db, "g1", "Кружка", 500)
+    db.patch_gift("g1", {"name": "Термос"})
+
+    assert search_all(client, q="кружка") == []
+    assert search_all(client, q="термос") == ["g1"]
+
+
+def test_cost_pages_are_ordered_and_filtered(client, db):
+    for i, cost in enumerate([900, 100, 500, 300, 700]):
+        add(db, f"g{i}", f"Подарок {i}", cost)
+
+    assert search_all(client, sort="cost") == ["g1", "g3", "g2", "g4", "g0"]
+    assert search_all(client, sort="-cost", max_cost=600) == ["g2", "g3", "g1"]
+
+
+def test_query_without_words_matches_nothing(client, db):
+    add(db, "g1", "Кружка", 500)
+
+    response = client.get("/gifts/search", params={"q": "!!! ..."})
+
+    assert response.json() == {"gifts": [], "next": None}
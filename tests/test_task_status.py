@@ -0,0 +1,33 @@
+import time
+
+import pytest
+
+import task_status
+from huey_config import huey
+
+
+@pytest.fixture(autouse=True)
+def empty_huey():
+    huey.storage.flush_results()
+    yield
+    huey.storage.flush_results()
+
+
+def test_prune_drops_stale_status_and_result():
+    huey.put(task_status.status_key("old"), {"status": "done", "updated_at": 1.0})
+    huey.put("old", {"status": "success"})
+    huey.put(
+        task_status.status_key("new"),
+        {"status": "done", "error": None, "updated_at": time.time()},
+    )
+    huey.put("new", {"status": "success"})
+
+    task_status.prune_task_status.call_local()
+
+    assert task_status.get_task_status("old") is None
+    assert huey.get("old", peek=True) is None
+    assert task_status.get_task_status("new") == {
+        "status": "done",
+        "error": None,
+        "result": {"status": "success"},
+    }
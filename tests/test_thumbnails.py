@@ -0,0 +1,53 @@
+import os
+from io import BytesIO
+
+import pytest
+
+from conftest import make_gift
+from utils import thumbnails
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def thumbnail_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnails, "THUMBNAIL_DIR", str(tmp_path))
+    return tmp_path
+
+
+def png(color: str) -> bytes:
+    body = BytesIO()
+    Image.new("RGB", (800, 600), color).save(body, "PNG")
+    return body.getvalue()
+
+
+def test_name_is_hash_of_encoded_bytes(thumbnail_dir, monkeypatch):
+    photos = {
+        "https://a.example/1.png": png("red"),
+        "https://b.example/2.png": png("red"),
+    }
+    monkeypatch.setattr(thumbnails, "fetch", lambda url, max_bytes: (photos[url], ""))
+
+    first = thumbnails.make_thumbnail("https://a.example/1.png")
+    second = thumbnails.make_thumbnail("https://b.example/2.png")
+
+    assert first == second
+    assert os.listdir(thumbnail_dir) == [first]
+
+
+def test_eviction_clears_rows_that_point_at_removed_files(db, thumbnail_dir):
+    for name, age in (("a" * 64 + ".webp", 100), ("b" * 64 + ".webp", 0)):
+        path = thumbnail_dir / name
+        path.write_bytes(b"x" * 10)
+        os.utime(path, (1000 - age, 1000 - age))
+    db.add_gift(make_gift("g1") | {"thumbnail": "a" * 64 + ".webp"})
+    db.add_gift(make_gift("g2") | {"thumbnail": "b" * 64 + ".webp"})
+    version = db.get_wishlist_version("user-1")
+
+    evicted = thumbnails.evict_thumbnails(max_bytes=10)
+
+    assert evicted == ["a" * 64 + ".webp"]
+    assert db.clear_thumbnails(evicted) == 1
+    assert db.get_gift_by_id("g1")["thumbnail"] is None
+    assert db.get_gift_by_id("g2")["thumbnail"] == "b" * 64 + ".webp"
+    assert db.get_wishlist_version("user-1") > version
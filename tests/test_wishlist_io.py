@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import make_gift
+from routers import gifts
+from utils.streaming import iter_lines
+from utils.wishlist_io import EXPORT_FIELDS
+
+TRICKY = [
+    make_gift("g1") | {"name": 'Кружка "Утро", 350 мл', "cost": 1299.5},
+    make_gift("g2") | {"name": "Плед\nдвухслойный", "photo": "https://img.example/p.jpg"},
+    make_gift("g3") | {"is_reserved": True, "reserve_owner": "bob"},
+]
+
+
+def wishlist(db, user_id: str = "user-1") -> list[tuple]:
+    return sorted(
+        tuple(gift[field] for field in EXPORT_FIELDS)
+        for gift in db.get_gifts_by_user_id(user_id)
+    )
+
+
+def delete_all(db):
+    for gift in db.get_gifts_by_user_id("user-1"):
+        db.delete_gift(gift["id"])
+
+
+@pytest.mark.parametrize("format", ["ndjson", "csv"])
+def test_export_then_import_gives_the_same_wishlist(client, db, format):
+    db.add_gifts(TRICKY)
+    before = wishlist(db)
+
+    exported = client.get(f"/gifts/user/user-1/export?format={format}")
+    assert exported.status_code == 200
+    delete_all(db)
+
+    imported = client.post(
+        f"/gifts/import?format={format}", content=exported.content
+    )
+
+    assert imported.json() == {"imported": 3, "skipped": 0, "errors": []}
+    assert wishlist(db) == before
+
+
+def test_bad_records_are_skipped_and_reported_by_line(client, db):
+    body = "\n".join(
+        [
+            json.dumps({"link": "https://shop.example.com/1", "name": "A", "cost": 10}),
+            "{not json",
+            json.dumps({"link": "https://shop.example.com/2", "name": "B"}),
+            json.dumps({"link": "http://127.0.0.1/", "name": "C", "cost": 1}),
+            "",
+            json.dumps({"link": "https://shop.example.com/3", "name": "D", "cost": -1}),
+            json.dumps({"link": "https://shop.example.com/4", "name": "E", "cost": 5}),
+        ]
+    )
+
+    result = client.post("/gifts/import", content=body.encode()).json()
+
+    assert (result["imported"], result["skipped"]) == (2, 4)
+    assert [error.split(":")[0] for error in result["errors"]] == [
+        "line 2",
+        "line 3",
+        "line 4",
+        "line 6",
+    ]
+    assert sorted(gift["name"] for gift in db.get_gifts_by_user_id("user-1")) == [
+        "A",
+        "E",
+    ]
+
+
+def test_csv_rows_with_wrong_column_count_are_skipped(client, db):
+    body = 'link,name,cost\nhttps://shop.example.com/1,"Multi\nline",10\nx,y\n'
+
+    result = client.post("/gifts/import?format=csv", content=body.encode()).json()
+
+    assert (result["imported"], result["skipped"]) == (1, 1)
+    assert result["errors"] == ["line 4: expected 3 columns, got 2"]
+    assert db.get_gifts_by_user_id("user-1")[0]["name"] == "Multi\nline"
+
+
+def test_stopped_import_reports_what_was_already_written(client, db, monkeypatch):
+    monkeypatch.setattr(gifts, "STREAM_BATCH_SIZE", 2)
+    monkeypatch.setattr(gifts, "IMPORT_MAX_LINE_BYTES", 200)
+    record = {"link": "https://shop.example.com/1", "name": "A", "cost": 10}
+    body = "\n".join([json.dumps(record)] * 3 + ["x" * 500])
+
+    response = client.post("/gifts/import", content=body.encode())
+
+    assert response.status_code == 400
+    assert "2 gifts were imported before the error" in response.json()["detail"]
+    assert len(db.get_gifts_by_user_id("user-1")) == 2
+
+
+def test_lines_are_split_across_chunk_boundaries():
+    async def chunks():
+        for chunk in (b"ab", b"c\nd", b"\n\xd0", b"\x9f\n", b"tail"):
+            yield chunk
+
+    async def collect():
+        return [line async for line in iter_lines(chunks(), max_line_bytes=10)]
+
+    assert asyncio.run(collect()) == ["abc\n", "d\n", "П\n", "tail"]
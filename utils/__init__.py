@@ -1,11 +1,3 @@
-from loguru import logger
+from .log import logger
 
-logger.add(
-    "logs.log",
-    rotation="10 MB",
-    retention="15 days",
-    compression="zip",
-    level="INFO"
-)
-
-__all__ = ["logger"]
\ No newline at end of file
+__all__ = ["logger"]
@@ -1,16 +1,26 @@
 import os
+import asyncio
 import jwt
 
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 
 from dotenv import load_dotenv
 from models.User import User
 from routers import db
-from utils.config import ALGORITHM
+from utils.cache import TTLCache
+from utils.config import (
+    ALGORITHM,
+    AUTH_CACHE_TTL_SECONDS,
+    AUTH_CACHE_MAX_ENTRIES,
+    BCRYPT_ROUNDS,
+    HASH_WORKERS,
+    HASH_MAX_QUEUE,
+)
 
 load_dotenv()
 
@@ -21,7 +31,17 @@ if SECRET_KEY is None:
     )
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+# bcrypt releases the GIL while hashing, so a small thread pool keeps the event
+# loop free without the pickling overhead of a process pool.
+hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_jobs = 0
+
+# Users resolved by get_current_user, keyed by token subject (username).
+user_cache = TTLCache(maxsize=AUTH_CACHE_MAX_ENTRIES, ttl=AUTH_CACHE_TTL_SECONDS)
 
 credentials_exception = HTTPException(
     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,12 +50,34 @@ credentials_exception = HTTPException(
 )
 
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+def hash_queue_depth() -> int:
+    """Number of hashing jobs waiting for a free bcrypt worker."""
+    return max(_hash_jobs - HASH_WORKERS, 0)
+
+
+async def _run_hash(func, *args):
+    global _hash_jobs
+    if hash_queue_depth() >= HASH_MAX_QUEUE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent authentication requests",
+            headers={"Retry-After": "1"},
+        )
+
+    _hash_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(hash_executor, func, *args)
+    finally:
+        _hash_jobs -= 1
+
 
+async def get_password_hash(password):
+    return await _run_hash(pwd_context.hash, password)
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+
+async def verify_password(plain_password, hashed_password):
+    return await _run_hash(pwd_context.verify, plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
@@ -49,6 +91,11 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 
+def invalidate_user(username: str):
+    """Drop a cached user. Call this whenever a user row changes."""
+    user_cache.pop(username)
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict[str, User]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -58,7 +105,10 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict[str, Use
     except jwt.PyJWTError:
         raise credentials_exception
 
-    user = db.get_user_by_username(username)
+    user = user_cache.get(username)
     if user is None:
-        raise credentials_exception
+        user = await db.get_user_by_username(username)
+        if user is None:
+            raise credentials_exception
+        user_cache.set(username, user)
     return {"user": user}
@@ -0,0 +1,280 @@
+import itertools
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import psutil
+from seleniumbase import SB
+
+from . import logger
+from utils.config import (
+    BROWSER_ALLOWED_URLS,
+    BROWSER_BLOCK_BASELINE_EVERY,
+    BROWSER_BLOCK_RESOURCES,
+    BROWSER_BLOCKED_URLS,
+    BROWSER_MAX_PAGES,
+    BROWSER_MAX_RSS_MB,
+    BROWSER_POOL_SIZE,
+)
+from utils.http_client import check_public_url
+from utils.metrics import Histogram
+
+# Bytes the page pulled over the network. Cross-origin resources without
+# Timing-Allow-Origin report 0, so this is a lower bound.
+PAGE_WEIGHT_JS = """
+return performance.getEntriesByType("navigation")
+    .concat(performance.getEntriesByType("resource"))
+    .reduce((total, entry) => total + (entry.transferSize || 0), 0);
+"""
+
+page_load_seconds = Histogram(
+    "gifts_browser_page_load_seconds", "Rendered page load time.", ["blocking"]
+)
+page_bytes = Histogram(
+    "gifts_browser_page_bytes",
+    "Bytes transferred per rendered page.",
+    ["blocking"],
+    buckets=(5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7, 2.5e7),
+)
+
+
+class BrowserSession:
+    """One long-lived undetected Chrome instance."""
+
+    def __init__(self):
+        self._context = SB(uc=True, headless=True)
+        self.sb = self._context.__enter__()
+        self.pages = 0
+        self.blocking = False
+        self.exempts_allowed = True
+
+    def is_healthy(self) -> bool:
+        try:
+            self.sb.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def set_blocking(self, enabled: bool) -> bool:
+        """Switch CDP URL blocking on or off for the following page loads.
+
+        Returns False when this Chrome can not exempt BROWSER_ALLOWED_URLS;
+        they are then blocked along with everything else.
+        """
+        if enabled == self.blocking:
+            return self.exempts_allowed
+
+        driver = self.sb.driver
+        driver.execute_cdp_cmd("Network.enable", {})
+        if enabled and BROWSER_ALLOWED_URLS and self.exempts_allowed:
+            # The first matching pattern decides, so allowed URLs go first.
+            patterns = [
+                {"urlPattern": pattern, "block": False}
+                for pattern in BROWSER_ALLOWED_URLS
+            ]
+            patterns += [
+                {"urlPattern": pattern, "block": True}
+                for pattern in BROWSER_BLOCKED_URLS
+            ]
+            try:
+                driver.execute_cdp_cmd(
+                    "Network.setBlockedURLs", {"urlPatterns": patterns}
+                )
+                self.blocking = True
+                return True
+            except Exception as e:
+                # Older Chrome only takes plain `urls`, which can not exempt.
+                logger.debug("Chrome rejected urlPatterns: {}", e)
+                self.exempts_allowed = False
+
+        urls = list(BROWSER_BLOCKED_URLS) if enabled else []
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+        self.blocking = enabled
+        return self.exempts_allowed
+
+    def rss_mb(self) -> float:
+        """Resident memory of chromedriver and every Chrome process under it."""
+        try:
+            driver = psutil.Process(self.sb.driver.service.process.pid)
+            rss = driver.memory_info().rss
+            for child in driver.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            return rss / 1024 / 1024
+        except (psutil.Error, AttributeError):
+            return 0.0
+
+    def close(self):
+        try:
+            self._context.__exit__(None, None, None)
+        except Exception as e:
+            logger.warning("Failed to close browser session: {}", e)
+
+
+class BrowserPool:
+    """Bounded pool of warm browser sessions shared by huey worker threads.
+
+    Sessions are created on first use and handed back after each page. A
+    session is recycled once it has served `max_pages` pages, grown past
+    `max_rss_mb`, failed a health check or raised while checked out.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_pages: int = BROWSER_MAX_PAGES,
+        max_rss_mb: int = BROWSER_MAX_RSS_MB,
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._idle: queue.LifoQueue[BrowserSession] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._busy: dict[int, BrowserSession] = {}
+        self._loads = itertools.count(1)
+        # [pages, seconds, bytes] of unblocked loads, the savings baseline.
+        self._baseline = [0, 0.0, 0]
+        self._baseline_lock = threading.Lock()
+        self._warned_exemptions = False
+
+    @contextmanager
+    def session(self):
+        self._slots.acquire()
+        session = None
+        try:
+            session = self._checkout()
+            self._busy[threading.get_ident()] = session
+            yield session.sb
+            session.pages += 1
+        except Exception:
+            if session is not None:
+                logger.warning("Discarding browser session after an error")
+                session.close()
+                session = None
+            raise
+        finally:
+            self._busy.pop(threading.get_ident(), None)
+            if session is not None:
+                self._checkin(session)
+            self._slots.release()
+
+    def open(self, url: str):
+        """Open `url` in the calling thread's session with resources blocked.
+
+        Every BROWSER_BLOCK_BASELINE_EVERY-th page loads unblocked, so the log
+        can report the bytes and time blocking saves per page. Raises
+        BlockedAddressError if the page is, or redirects to, a non-public host.
+        """
+        session = self._busy[threading.get_ident()]
+        baseline = (
+            BROWSER_BLOCK_BASELINE_EVERY
+            and next(self._loads) % BROWSER_BLOCK_BASELINE_EVERY == 0
+        )
+        exempted = session.set_blocking(BROWSER_BLOCK_RESOURCES and not baseline)
+        if not exempted and not self._warned_exemptions:
+            self._warned_exemptions = True
+            logger.warning(
+                "Chrome can not exempt BROWSER_ALLOWED_URLS, blocking them too"
+            )
+
+        check_public_url(url)
+        started = time.perf_counter()
+        session.sb.open(url)
+        elapsed = time.perf_counter() - started
+        # Chrome follows redirects itself, so check where it ended up.
+        check_public_url(session.sb.get_current_url())
+        try:
+            transferred = int(session.sb.execute_script(PAGE_WEIGHT_JS) or 0)
+        except Exception as e:
+            logger.debug("Could not read page weight: {}", e)
+            transferred = 0
+        self._record_page(url, session.blocking, elapsed, transferred)
+
+    def _record_page(
+        self, url: str, blocking: bool, elapsed: float, transferred: int
+    ):
+        label = "on" if blocking else "off"
+        page_load_seconds.observe(elapsed, blocking=label)
+        page_bytes.observe(transferred, blocking=label)
+
+        with self._baseline_lock:
+            if not blocking:
+                self._baseline[0] += 1
+                self._baseline[1] += elapsed
+                self._baseline[2] += transferred
+            pages, seconds, total_bytes = self._baseline
+
+        if not blocking or not pages:
+            logger.info(
+                "Loaded {} in {:.0f} ms, {:.0f} KiB, blocking {}",
+                url,
+                elapsed * 1000,
+                transferred / 1024,
+                label,
+            )
+            return
+
+        # Savings against the average unblocked page seen so far.
+        logger.info(
+            "Loaded {} in {:.0f} ms, {:.0f} KiB, "
+            "blocking saved ~{:.0f} KiB and ~{:.0f} ms",
+            url,
+            elapsed * 1000,
+            transferred / 1024,
+            (total_bytes / pages - transferred) / 1024,
+            (seconds / pages - elapsed) * 1000,
+        )
+
+    def abort(self, thread_id: int) -> bool:
+        """Kill the session checked out by `thread_id`.
+
+        Used when a parse times out: a hung WebDriver call can not be
+        interrupted, but it raises once its browser is gone, which returns the
+        thread and the pool slot.
+        """
+        session = self._busy.get(thread_id)
+        if session is None:
+            return False
+        logger.warning("Killing browser session of a timed out parse")
+        session.close()
+        return True
+
+    def _checkout(self) -> BrowserSession:
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                logger.info("Starting a new browser session")
+                return BrowserSession()
+
+            if session.is_healthy():
+                return session
+            logger.warning("Dropping unhealthy browser session")
+            session.close()
+
+    def _checkin(self, session: BrowserSession):
+        if session.pages >= self.max_pages:
+            logger.info("Recycling browser session after {} pages", session.pages)
+            session.close()
+            return
+
+        rss_mb = session.rss_mb()
+        if rss_mb > self.max_rss_mb:
+            logger.info("Recycling browser session at {:.0f} MB RSS", rss_mb)
+            session.close()
+            return
+
+        self._idle.put(session)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+browser_pool = BrowserPool()
@@ -1,2 +1,109 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7 * 30
-ALGORITHM = "HS256"
\ No newline at end of file
+ALGORITHM = "HS256"
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 4))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", 5000))
+
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 200
+
+PARSE_CACHE_TTL_SECONDS = int(os.getenv("PARSE_CACHE_TTL_SECONDS", 6 * 60 * 60))
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", 10000))
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 2))
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", 50))
+BROWSER_MAX_RSS_MB = int(os.getenv("BROWSER_MAX_RSS_MB", 1024))
+
+# Rendered pages only need the DOM: images, fonts, media, trackers and ads are
+# blocked by URL pattern (`*` wildcards). Allowed patterns win over blocked ones.
+DEFAULT_BLOCKED_URLS = (
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m3u8",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*mc.yandex.ru*", "*an.yandex.ru*", "*top-fwz1.mail.ru*", "*vk.com/rtrg*",
+)
+BROWSER_BLOCK_RESOURCES = bool(int(os.getenv("BROWSER_BLOCK_RESOURCES", 1)))
+BROWSER_BLOCKED_URLS = tuple(
+    pattern.strip()
+    for pattern in os.getenv(
+        "BROWSER_BLOCKED_URLS", ",".join(DEFAULT_BLOCKED_URLS)
+    ).split(",")
+    if pattern.strip()
+)
+BROWSER_ALLOWED_URLS = tuple(
+    pattern.strip()
+    for pattern in os.getenv("BROWSER_ALLOWED_URLS", "").split(",")
+    if pattern.strip()
+)
+# Every Nth page loads without blocking, to measure what blocking saves.
+BROWSER_BLOCK_BASELINE_EVERY = int(os.getenv("BROWSER_BLOCK_BASELINE_EVERY", 50))
+
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", 5))
+BROWSER_WAIT_SECONDS = float(os.getenv("BROWSER_WAIT_SECONDS", 10))
+
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", 30))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", 10000))
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", 2))
+HASH_MAX_QUEUE = int(os.getenv("HASH_MAX_QUEUE", 64))
+
+BATCH_MAX_LINKS = 100
+# Parsed batch items are written once this many are pending, or this long after
+# the previous write, so a slow link does not hold back the rest of the batch.
+BATCH_FLUSH_SIZE = int(os.getenv("BATCH_FLUSH_SIZE", 10))
+BATCH_FLUSH_SECONDS = float(os.getenv("BATCH_FLUSH_SECONDS", 5))
+
+IMPORT_MAX_LINE_BYTES = 1024 * 1024
+IMPORT_MAX_ERRORS = 20
+
+TASK_STATUS_POLL_SECONDS = 0.25
+TASK_STATUS_MAX_WAIT_SECONDS = 60
+TASK_STATUS_TTL_SECONDS = int(os.getenv("TASK_STATUS_TTL_SECONDS", 24 * 60 * 60))
+
+LOG_FILE = os.getenv("LOG_FILE", "logs.log")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_JSON = bool(int(os.getenv("LOG_JSON", 1)))
+LOG_SUCCESS_SAMPLE_RATE = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", 1))
+LOG_SUCCESS_SAMPLE_RATES = {
+    function: float(rate)
+    for function, rate in (
+        item.split("=")
+        for item in os.getenv("LOG_SUCCESS_SAMPLE_RATES", "").split(",")
+        if "=" in item
+    )
+}
+
+WISHLIST_CACHE_CONTROL = "public, no-cache"
+
+READ_CACHE_MAX_ENTRIES = int(os.getenv("READ_CACHE_MAX_ENTRIES", 5000))
+
+PRICE_REFRESH_EVERY_MINUTES = int(os.getenv("PRICE_REFRESH_EVERY_MINUTES", 15))
+PRICE_REFRESH_BATCH_SIZE = int(os.getenv("PRICE_REFRESH_BATCH_SIZE", 20))
+PRICE_REFRESH_DELAY_SECONDS = float(os.getenv("PRICE_REFRESH_DELAY_SECONDS", 3))
+PRICE_REFRESH_MAX_AGE_SECONDS = int(
+    os.getenv("PRICE_REFRESH_MAX_AGE_SECONDS", 24 * 60 * 60)
+)
+
+THUMBNAIL_DIR = os.getenv("THUMBNAIL_DIR", "thumbnails")
+THUMBNAIL_SIZE = int(os.getenv("THUMBNAIL_SIZE", 320))
+THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", 75))
+THUMBNAIL_MAX_SOURCE_BYTES = int(
+    os.getenv("THUMBNAIL_MAX_SOURCE_BYTES", 10 * 1024 * 1024)
+)
+THUMBNAIL_MAX_DIR_BYTES = int(os.getenv("THUMBNAIL_MAX_DIR_BYTES", 512 * 1024 * 1024))
+
+PRIORITY_INTERACTIVE = 100
+PRIORITY_BATCH = 50
+PRIORITY_BACKGROUND = 0
+
+PARSE_TIMEOUT_SECONDS = float(os.getenv("PARSE_TIMEOUT_SECONDS", 90))
+PARSE_RETRIES = int(os.getenv("PARSE_RETRIES", 3))
+PARSE_RETRY_DELAY_SECONDS = float(os.getenv("PARSE_RETRY_DELAY_SECONDS", 5))
+PARSE_INFLIGHT_TTL_SECONDS = int(os.getenv("PARSE_INFLIGHT_TTL_SECONDS", 15 * 60))
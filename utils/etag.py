@@ -0,0 +1,22 @@
+import zlib
+
+from fastapi import Request
+
+
+def make_etag(version: int, request: Request) -> str:
+    """Strong ETag for one representation of a versioned resource.
+
+    The query string is folded in, so pages and formats of the same wishlist
+    version get distinct tags.
+    """
+    variant = zlib.crc32(str(request.query_params).encode())
+    return f'"{version}-{variant:08x}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in header.split(","))
@@ -0,0 +1,131 @@
+import html
+import json
+import re
+from html.parser import HTMLParser
+
+PRICE_STATE_RE = re.compile(r"state-webPrice-")
+
+
+def parse_price(text: str) -> float:
+    """Turn a rendered price such as `1 299,50 ₽` into a float."""
+    digits = re.sub(r"[^\d,.]", "", text).replace(",", ".")
+    if digits.count(".") > 1:
+        whole, _, fraction = digits.rpartition(".")
+        digits = whole.replace(".", "") + "." + fraction
+    return float(digits) if digits else 0.0
+
+
+class _ProductHTMLParser(HTMLParser):
+    """Collects the parts of a product page that carry structured data."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld: list[str] = []
+        self.meta: dict[str, str] = {}
+        self.price_states: list[str] = []
+        self._in_json_ld = False
+        self._buffer: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "script" and attrs.get("type") == "application/ld+json":
+            self._in_json_ld = True
+            self._buffer = []
+        elif tag == "meta":
+            key = attrs.get("property") or attrs.get("name")
+            if key and attrs.get("content") and key not in self.meta:
+                self.meta[key] = attrs["content"]
+        elif attrs.get("data-state") and PRICE_STATE_RE.match(attrs.get("id") or ""):
+            self.price_states.append(attrs["data-state"])
+
+    def handle_data(self, data):
+        if self._in_json_ld:
+            self._buffer.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._in_json_ld:
+            self.json_ld.append("".join(self._buffer))
+            self._in_json_ld = False
+
+
+def _iter_json_ld_nodes(raw: str):
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            yield node
+            if "@graph" in node:
+                stack.append(node["@graph"])
+
+
+def _first_url(value) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and value:
+        return _first_url(value[0])
+    if isinstance(value, dict):
+        return value.get("url") or value.get("contentUrl") or ""
+    return ""
+
+
+def _offer_price(offers) -> float:
+    if isinstance(offers, list):
+        offers = offers[0] if offers else {}
+    if not isinstance(offers, dict):
+        return 0.0
+    price = offers.get("price", offers.get("lowPrice"))
+    if price is None:
+        return 0.0
+    return parse_price(str(price))
+
+
+def extract_product(page: str) -> dict | None:
+    """Extract name, photo and price from JSON-LD, OpenGraph or Ozon page state.
+
+    Returns None unless both a name and a price were found, so callers can fall
+    back to rendering the page.
+    """
+    parser = _ProductHTMLParser()
+    parser.feed(page)
+
+    name, photo, cost = "", "", 0.0
+
+    for raw in parser.json_ld:
+        for node in _iter_json_ld_nodes(raw):
+            types = node.get("@type")
+            types = types if isinstance(types, list) else [types]
+            if "Product" not in types:
+                continue
+            name = name or html.unescape(str(node.get("name") or "")).strip()
+            photo = photo or _first_url(node.get("image"))
+            cost = cost or _offer_price(node.get("offers"))
+
+    meta = parser.meta
+    name = name or meta.get("og:title", "").strip()
+    photo = photo or meta.get("og:image", "")
+    if not cost:
+        for key in ("product:price:amount", "og:price:amount"):
+            if meta.get(key):
+                cost = parse_price(meta[key])
+                break
+
+    if not cost:
+        for raw in parser.price_states:
+            try:
+                state = json.loads(raw)
+            except ValueError:
+                continue
+            price = state.get("cardPrice") or state.get("price")
+            if price:
+                cost = parse_price(str(price))
+                break
+
+    if not name or not cost:
+        return None
+    return {"name": name, "photo": photo, "cost": cost}
@@ -0,0 +1,140 @@
+import gzip
+import ipaddress
+import socket
+import zlib
+from http.client import HTTPConnection, HTTPSConnection
+from urllib.parse import urlsplit
+from urllib.request import (
+    HTTPHandler,
+    HTTPRedirectHandler,
+    HTTPSHandler,
+    ProxyHandler,
+    Request,
+    build_opener,
+)
+
+from utils.config import HTTP_TIMEOUT_SECONDS
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class BlockedAddressError(ValueError):
+    """A link points at a loopback, private or otherwise non-public address."""
+
+
+def is_public_address(address: str) -> bool:
+    return ipaddress.ip_address(address.split("%")[0]).is_global
+
+
+def resolve_public(host: str, port: int) -> list[tuple]:
+    """getaddrinfo() for `host`, refusing it if any address is not public."""
+    addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    for *_, sockaddr in addresses:
+        if not is_public_address(sockaddr[0]):
+            raise BlockedAddressError(f"{host} resolves to {sockaddr[0]}")
+    return addresses
+
+
+def check_public_url(url: str):
+    """Raise BlockedAddressError unless `url` is http(s) on a public host."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise BlockedAddressError(f"Refusing to fetch {url}")
+    default_port = 443 if parts.scheme == "https" else 80
+    resolve_public(parts.hostname, parts.port or default_port)
+
+
+def _connect_public(address, timeout, source_address=None):
+    """socket.create_connection() that only connects to checked addresses.
+
+    The checked address itself is dialled, so a second DNS answer can not
+    swap in a private one.
+    """
+    error = None
+    for *_, sockaddr in resolve_public(*address):
+        try:
+            return socket.create_connection(sockaddr[:2], timeout, source_address)
+        except OSError as e:
+            error = e
+    raise error
+
+
+class _PublicHTTPConnection(HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _connect_public
+
+
+class _PublicHTTPSConnection(HTTPSConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _connect_public
+
+
+class _PublicHTTPHandler(HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PublicHTTPConnection, req)
+
+
+class _PublicHTTPSHandler(HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PublicHTTPSConnection, req, context=self._context)
+
+
+class _PublicRedirectHandler(HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        if urlsplit(newurl).scheme not in ("http", "https"):
+            raise BlockedAddressError(f"Refusing redirect to {newurl}")
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+# Links come from users, so every connection, redirects included, goes to a
+# public address. Proxies are off: they would hide the target from the check.
+_opener = build_opener(
+    ProxyHandler({}),
+    _PublicHTTPHandler,
+    _PublicHTTPSHandler,
+    _PublicRedirectHandler,
+)
+
+
+def fetch(
+    url: str, timeout: float = HTTP_TIMEOUT_SECONDS, max_bytes: int | None = None
+) -> tuple[bytes, str]:
+    """GET `url` and return the decoded body and its content type.
+
+    With `max_bytes` set, larger bodies raise ValueError instead of being
+    read into memory whole. Non-public targets raise BlockedAddressError.
+    """
+    request = Request(url, headers=DEFAULT_HEADERS)
+    with _opener.open(request, timeout=timeout) as response:
+        if max_bytes is None:
+            body = response.read()
+        else:
+            body = response.read(max_bytes + 1)
+            if len(body) > max_bytes:
+                raise ValueError(f"Response from {url} exceeds {max_bytes} bytes")
+        encoding = response.headers.get("Content-Encoding", "")
+        content_type = response.headers.get("Content-Type", "")
+
+    if encoding == "gzip":
+        body = gzip.decompress(body)
+    elif encoding == "deflate":
+        body = zlib.decompress(body)
+    return body, content_type
+
+
+def fetch_html(url: str, timeout: float = HTTP_TIMEOUT_SECONDS) -> str:
+    body, content_type = fetch(url, timeout)
+    charset = "utf-8"
+    if "charset=" in content_type:
+        charset = content_type.split("charset=")[-1].split(";")[0].strip()
+    return body.decode(charset, errors="replace")
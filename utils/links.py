@@ -0,0 +1,76 @@
+import ipaddress
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+OZON_PRODUCT_RE = re.compile(r"/product/(?:[^/]*-)?(\d+)/?")
+WB_PRODUCT_RE = re.compile(r"/catalog/(\d+)/")
+
+# Query parameters that only attribute the visit and never select a product.
+TRACKING_PARAMS = {
+    "_openstat", "fbclid", "gclid", "mc_cid", "mc_eid", "msclkid", "yclid", "ysclid",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+
+def absolute_url(link: str) -> str:
+    """Add the https scheme to links pasted without one."""
+    link = link.strip()
+    return link if urlsplit(link).netloc else "https://" + link
+
+
+def link_host(link: str) -> str:
+    """Lowercase host of `link` without port and leading `www.`."""
+    host = urlsplit(absolute_url(link)).netloc.lower().split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def host_matches(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+def is_supported_link(link: str) -> bool:
+    """Any http(s) link with a real host name can be parsed.
+
+    IP literals and local names are refused up front; the worker still checks
+    what the host resolves to before connecting.
+    """
+    parts = urlsplit(absolute_url(link))
+    host = link_host(link)
+    if parts.scheme not in ("http", "https") or "." not in host:
+        return False
+    try:
+        ipaddress.ip_address(host)
+        return False
+    except ValueError:
+        pass
+    return not host.endswith((".localhost", ".local", ".internal"))
+
+
+def normalize_link(link: str) -> str:
+    """Reduce a product link to a stable cache key.
+
+    Ozon and Wildberries product pages become `ozon:<id>` and `wb:<id>`, so
+    slugs, query strings and tracking parameters all map to the same key. Any
+    other link keeps host, path and its sorted query without tracking
+    parameters, since the query may be what selects the product.
+    """
+    host = link_host(link)
+    parts = urlsplit(absolute_url(link))
+    path = parts.path
+
+    if host_matches(host, "ozon.ru"):
+        match = OZON_PRODUCT_RE.search(path)
+        if match:
+            return f"ozon:{match.group(1)}"
+    elif host_matches(host, "wildberries.ru"):
+        match = WB_PRODUCT_RE.search(path)
+        if match:
+            return f"wb:{match.group(1)}"
+
+    key = f"{host}{path.rstrip('/')}"
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in TRACKING_PARAMS and not name.startswith(TRACKING_PREFIXES)
+    )
+    return f"{key}?{urlencode(query)}" if query else key
@@ -0,0 +1,43 @@
+import random
+import sys
+
+from loguru import logger
+
+from utils.config import (
+    LOG_FILE,
+    LOG_LEVEL,
+    LOG_JSON,
+    LOG_SUCCESS_SAMPLE_RATE,
+    LOG_SUCCESS_SAMPLE_RATES,
+)
+
+
+def sample_success(record) -> bool:
+    """Keep every record except a sampled share of SUCCESS lines.
+
+    Rates are looked up by the logging function, which is the route handler
+    for API logs, e.g. LOG_SUCCESS_SAMPLE_RATES="get_gifts=0.05,get_gift=0.1".
+    """
+    if record["level"].name != "SUCCESS":
+        return True
+    rate = LOG_SUCCESS_SAMPLE_RATES.get(record["function"], LOG_SUCCESS_SAMPLE_RATE)
+    return rate >= 1 or random.random() < rate
+
+
+def configure_logging():
+    """Install the process-wide sinks. Both sinks write from a background thread."""
+    logger.remove()
+    logger.add(sys.stderr, level=LOG_LEVEL, enqueue=True, filter=sample_success)
+    logger.add(
+        LOG_FILE,
+        rotation="10 MB",
+        retention="15 days",
+        compression="zip",
+        level=LOG_LEVEL,
+        enqueue=True,
+        serialize=LOG_JSON,
+        filter=sample_success,
+    )
+
+
+configure_logging()
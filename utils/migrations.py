@@ -0,0 +1,351 @@
+import sqlite3
+
+from . import logger
+
+# Ordered schema migrations. The applied version is kept in PRAGMA user_version,
+# so every migration runs exactly once per database. Never edit a migration that
+# has shipped: append a new one instead.
+MIGRATIONS: list[tuple[int, str, list[str]]] = [
+    (
+        1,
+        "initial schema",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                id TEXT PRIMARY KEY,
+                username TEXT NOT NULL,
+                password TEXT NOT NULL
+            );
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS gifts (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                cost REAL NOT NULL,
+                link TEXT NOT NULL,
+                photo TEXT,
+                is_reserved BOOLEAN NOT NULL,
+                reserve_owner TEXT,
+                user_id TEXT,
+                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+            );
+            """,
+        ],
+    ),
+    (
+        2,
+        "index gifts by owner, unique usernames",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_gifts_user_id ON gifts (user_id);",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users (username);",
+        ],
+    ),
+    (
+        3,
+        "extend owner index with id for keyset pagination",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_gifts_user_id_id ON gifts (user_id, id);",
+            "DROP INDEX IF EXISTS idx_gifts_user_id;",
+        ],
+    ),
+    (
+        4,
+        "parse result cache",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                cost REAL NOT NULL,
+                photo TEXT,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_parse_cache_accessed_at ON parse_cache (accessed_at);",
+            """
+            CREATE TABLE IF NOT EXISTS parse_cache_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """,
+        ],
+    ),
+    (
+        5,
+        "bulk import batches",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS gift_batches (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                flushed BOOLEAN NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL
+            );
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS gift_batch_items (
+                gift_id TEXT PRIMARY KEY,
+                batch_id TEXT NOT NULL,
+                link TEXT NOT NULL,
+                status TEXT NOT NULL,
+                name TEXT,
+                cost REAL,
+                photo TEXT,
+                error TEXT,
+                FOREIGN KEY (batch_id) REFERENCES gift_batches (id) ON DELETE CASCADE
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_gift_batch_items_batch ON gift_batch_items (batch_id, status);",
+        ],
+    ),
+    (
+        6,
+        "per-user wishlist versions maintained by triggers",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS wishlist_versions (
+                user_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            );
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_insert_version
+            AFTER INSERT ON gifts WHEN NEW.user_id IS NOT NULL
+            BEGIN
+                INSERT INTO wishlist_versions (user_id, version) VALUES (NEW.user_id, 1)
+                ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_update_version
+            AFTER UPDATE ON gifts WHEN OLD.user_id IS NOT NULL
+            BEGIN
+                INSERT INTO wishlist_versions (user_id, version) VALUES (OLD.user_id, 1)
+                ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_update_owner_version
+            AFTER UPDATE OF user_id ON gifts
+            WHEN NEW.user_id IS NOT NULL AND NEW.user_id IS NOT OLD.user_id
+            BEGIN
+                INSERT INTO wishlist_versions (user_id, version) VALUES (NEW.user_id, 1)
+                ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_delete_version
+            AFTER DELETE ON gifts WHEN OLD.user_id IS NOT NULL
+            BEGIN
+                INSERT INTO wishlist_versions (user_id, version) VALUES (OLD.user_id, 1)
+                ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            END;
+            """,
+        ],
+    ),
+    (
+        7,
+        "price refresh bookkeeping and price history",
+        [
+            "ALTER TABLE gifts ADD COLUMN price_checked_at REAL;",
+            """
+            CREATE INDEX IF NOT EXISTS idx_gifts_price_refresh
+            ON gifts (is_reserved, price_checked_at);
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS gift_prices (
+                gift_id TEXT NOT NULL,
+                checked_at REAL NOT NULL,
+                cost REAL NOT NULL,
+                PRIMARY KEY (gift_id, checked_at)
+            ) WITHOUT ROWID;
+            """,
+            """
+            INSERT OR IGNORE INTO gift_prices (gift_id, checked_at, cost)
+            SELECT id, CAST(strftime('%s', 'now') AS REAL), cost FROM gifts;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_insert_price
+            AFTER INSERT ON gifts
+            BEGIN
+                INSERT OR IGNORE INTO gift_prices (gift_id, checked_at, cost)
+                VALUES (NEW.id, CAST(strftime('%s', 'now') AS REAL), NEW.cost);
+                UPDATE gifts SET price_checked_at = CAST(strftime('%s', 'now') AS REAL)
+                WHERE id = NEW.id;
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_update_price
+            AFTER UPDATE OF cost ON gifts WHEN NEW.cost IS NOT OLD.cost
+            BEGIN
+                INSERT OR REPLACE INTO gift_prices (gift_id, checked_at, cost)
+                VALUES (
+                    NEW.id,
+                    COALESCE(NEW.price_checked_at, CAST(strftime('%s', 'now') AS REAL)),
+                    NEW.cost
+                );
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_delete_prices
+            AFTER DELETE ON gifts
+            BEGIN
+                DELETE FROM gift_prices WHERE gift_id = OLD.id;
+            END;
+            """,
+            # Refresh bookkeeping alone must not invalidate cached wishlists.
+            "DROP TRIGGER IF EXISTS trg_gifts_update_version;",
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_update_version
+            AFTER UPDATE OF name, cost, link, photo, is_reserved, reserve_owner, user_id
+            ON gifts WHEN OLD.user_id IS NOT NULL
+            BEGIN
+                INSERT INTO wishlist_versions (user_id, version) VALUES (OLD.user_id, 1)
+                ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            END;
+            """,
+        ],
+    ),
+    (
+        8,
+        "local thumbnails",
+        [
+            "ALTER TABLE gifts ADD COLUMN thumbnail TEXT;",
+            "ALTER TABLE parse_cache ADD COLUMN thumbnail TEXT;",
+            "ALTER TABLE gift_batch_items ADD COLUMN thumbnail TEXT;",
+        ],
+    ),
+    (
+        9,
+        "in-flight parses shared by every gift waiting on the same link",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS parse_inflight (
+                gift_id TEXT PRIMARY KEY,
+                key TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                link TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_parse_inflight_key ON parse_inflight (key, created_at);",
+        ],
+    ),
+    (
+        10,
+        "full-text search over gift names",
+        [
+            # External-content index keyed by the gifts rowid. VACUUM may
+            # renumber rowids, so run INSERT INTO gifts_fts(gifts_fts)
+            # VALUES ('rebuild') after one.
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS gifts_fts USING fts5(
+                name,
+                content = 'gifts',
+                content_rowid = 'rowid',
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            """,
+            "INSERT INTO gifts_fts (gifts_fts) VALUES ('rebuild');",
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_insert_fts
+            AFTER INSERT ON gifts
+            BEGIN
+                INSERT INTO gifts_fts (rowid, name) VALUES (NEW.rowid, NEW.name);
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_update_fts
+            AFTER UPDATE OF name ON gifts
+            BEGIN
+                INSERT INTO gifts_fts (gifts_fts, rowid, name)
+                VALUES ('delete', OLD.rowid, OLD.name);
+                INSERT INTO gifts_fts (rowid, name) VALUES (NEW.rowid, NEW.name);
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_delete_fts
+            AFTER DELETE ON gifts
+            BEGIN
+                INSERT INTO gifts_fts (gifts_fts, rowid, name)
+                VALUES ('delete', OLD.rowid, OLD.name);
+            END;
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_gifts_cost_id ON gifts (cost, id);",
+            """
+            CREATE INDEX IF NOT EXISTS idx_gifts_reserved_cost_id
+            ON gifts (is_reserved, cost, id);
+            """,
+        ],
+    ),
+    (
+        11,
+        "clear evicted thumbnails from cached wishlists",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_gifts_thumbnail ON gifts (thumbnail);",
+            "DROP TRIGGER IF EXISTS trg_gifts_update_version;",
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_gifts_update_version
+            AFTER UPDATE OF name, cost, link, photo, thumbnail, is_reserved,
+                reserve_owner, user_id
+            ON gifts WHEN OLD.user_id IS NOT NULL
+            BEGIN
+                INSERT INTO wishlist_versions (user_id, version) VALUES (OLD.user_id, 1)
+                ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+            END;
+            """,
+        ],
+    ),
+    (
+        12,
+        "write bulk imports in chunks while they are parsed",
+        [
+            "ALTER TABLE gift_batches ADD COLUMN flushed_at REAL;",
+            "ALTER TABLE gift_batch_items ADD COLUMN written BOOLEAN NOT NULL DEFAULT 0;",
+            "UPDATE gift_batches SET flushed_at = created_at;",
+            """
+            UPDATE gift_batch_items SET written = 1
+            WHERE status = 'done'
+            AND batch_id IN (SELECT id FROM gift_batches WHERE flushed = 1);
+            """,
+        ],
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection: sqlite3.Connection) -> int:
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(connection: sqlite3.Connection) -> int:
+    """Apply pending migrations and return the resulting schema version.
+
+    Each migration runs in its own write transaction. The version is re-read
+    after taking the write lock, so an API process and a huey consumer starting
+    at the same time never apply the same migration twice.
+    """
+    if get_schema_version(connection) >= LATEST_VERSION:
+        return get_schema_version(connection)
+
+    for version, description, statements in MIGRATIONS:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(connection) >= version:
+                connection.rollback()
+                continue
+
+            logger.info("Applying migration {}: {}", version, description)
+            for statement in statements:
+                connection.execute(statement)
+            connection.execute(f"PRAGMA user_version = {version}")
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+    return get_schema_version(connection)
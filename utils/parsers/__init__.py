@@ -0,0 +1,9 @@
+"""Marketplace parsers.
+
+Each shop module registers its parser for its domains; `parse_url` routes a
+link to it and falls back to the generic JSON-LD/OpenGraph HTTP parser.
+"""
+from .registry import ParseError, get_parser, parse_url, register
+from . import ozon, wildberries, yandex_market  # noqa: F401  register parsers
+
+__all__ = ["ParseError", "get_parser", "parse_url", "register"]
@@ -0,0 +1,22 @@
+from utils import logger
+from utils.extract import extract_product
+from utils.http_client import fetch_html
+
+
+def parse_url_http(url: str) -> dict | None:
+    """Read JSON-LD/OpenGraph product data from the raw HTML, no browser."""
+    try:
+        parsed = extract_product(fetch_html(url))
+    except Exception as e:
+        logger.info("HTTP fetch failed: {}", e)
+        return None
+
+    if parsed:
+        logger.info("Parsed over HTTP: {}", parsed["name"])
+    return parsed
+
+
+def parse_url_generic(url: str) -> dict | None:
+    """Default parser for shops without a dedicated one."""
+    logger.info("Parsing {} over HTTP.", url)
+    return parse_url_http(url)
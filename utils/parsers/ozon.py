@@ -0,0 +1,101 @@
+from selenium.common import NoSuchElementException
+
+from utils import logger
+from utils.browser_pool import browser_pool
+from utils.config import BROWSER_WAIT_SECONDS
+from utils.extract import parse_price
+
+from .generic import parse_url_http
+from .registry import register
+
+errors = [NoSuchElementException]
+
+PHOTO_SELECTORS = [
+    'img[src*="cover.jpg"][loading="eager"]',
+    'img[data-lcp-name="webGallery-3311626-default-1"]',
+    'img[data-lcp-name="webGallery-3311629-default-1"]',
+]
+PRICE_SELECTORS = [
+    'button[class*="a2020-a4"] span span',
+    'div[data-widget*="webPrice"] div div div div span',
+]
+
+
+@register("ozon.ru")
+def parse_url_ozon(url: str):
+    logger.info("_____________________________________________")
+    logger.info("Start to parse OZON.")
+
+    parsed = parse_url_http(url)
+    if parsed:
+        return parsed
+
+    logger.info("HTTP extraction failed, falling back to the browser.")
+    return parse_url_ozon_browser(url)
+
+
+def parse_url_ozon_browser(url: str):
+    name: str = ""
+    photo: str = ""
+    cost: float = 0.0
+    cost_element = ""
+
+    with browser_pool.session() as sb:
+        browser_pool.open(url)
+        logger.info("Trying to find title.")
+
+        try:
+            sb.wait_for_element_visible("h1", timeout=BROWSER_WAIT_SECONDS)
+            name = sb.get_text("h1")
+            logger.info("Found title: {}", name)
+        except Exception as e:
+            logger.error("Find title failed: {}", e)
+
+        logger.info("Trying to find photo.")
+        photo_selectors = PHOTO_SELECTORS
+        try:
+            sb.wait_for_element_present(", ".join(photo_selectors), timeout=2)
+        except Exception as e:
+            logger.debug("No gallery image appeared: {}", e)
+
+        for selector in photo_selectors:
+            if not sb.is_element_present(selector):
+                continue
+            try:
+                photo = sb.get_attribute(selector, "src", timeout=2)
+                if photo:
+                    if "cover" in selector:
+                        logger.info("Video detected. Clicking on data-index=1 element.")
+                        try:
+                            sb.click('div[data-index="1"]')
+                            sb.wait_for_element_present(
+                                ", ".join(photo_selectors[1:]), timeout=2
+                            )
+                            continue
+                        except Exception as e:
+                            logger.error("Click failed: {}", e)
+
+                    logger.info("Found photo: {}", photo)
+                    break
+            except Exception as e:
+                logger.debug("Selector {} failed: {}", selector, e)
+                continue
+
+        logger.info("Trying to find price.")
+        try:
+            sb.wait_for_element_present(", ".join(PRICE_SELECTORS), timeout=2)
+        except Exception as e:
+            logger.debug("No price element appeared: {}", e)
+
+        for method, selector in enumerate(PRICE_SELECTORS, start=1):
+            if not sb.is_element_present(selector):
+                logger.debug("Find cost (method {}): Failed.", method)
+                continue
+            cost_element = sb.find_element(selector, timeout=1)
+            logger.debug("Find cost (method {}): Success.", method)
+            break
+
+        if cost_element:
+            cost = parse_price(cost_element.text)
+
+    return {"name": name, "photo": photo, "cost": cost}
@@ -0,0 +1,48 @@
+from typing import Callable
+
+from utils.http_client import check_public_url
+from utils.links import absolute_url, host_matches, link_host
+
+from .generic import parse_url_generic
+
+Parser = Callable[[str], dict | None]
+
+_PARSERS: dict[str, Parser] = {}
+
+
+class ParseError(Exception):
+    """No product data could be extracted from a link."""
+
+
+def register(*domains: str):
+    """Route links on `domains` and their subdomains to the decorated parser."""
+
+    def decorator(parser: Parser) -> Parser:
+        for domain in domains:
+            _PARSERS[domain] = parser
+        return parser
+
+    return decorator
+
+
+def get_parser(link: str) -> Parser:
+    """The registered parser for the link's host, else the generic HTTP parser."""
+    host = link_host(link)
+    for domain, parser in _PARSERS.items():
+        if host_matches(host, domain):
+            return parser
+    return parse_url_generic
+
+
+def parse_url(link: str) -> dict:
+    """Parse `link` with its marketplace parser.
+
+    Raises ParseError when the parser finds no product name, so callers never
+    store an empty gift, and BlockedAddressError for non-public hosts.
+    """
+    url = absolute_url(link)
+    check_public_url(url)
+    parsed = get_parser(link)(url)
+    if not parsed or not parsed.get("name"):
+        raise ParseError(f"No product data found at {link}")
+    return parsed
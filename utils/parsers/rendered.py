@@ -0,0 +1,18 @@
+from utils import logger
+from utils.browser_pool import browser_pool
+from utils.config import BROWSER_WAIT_SECONDS
+from utils.extract import extract_product
+
+
+def parse_url_rendered(url: str) -> dict | None:
+    """Render `url` in the browser pool and read structured data from the DOM.
+
+    Only for shops that refuse plain HTTP clients or build the page in JS.
+    """
+    with browser_pool.session() as sb:
+        browser_pool.open(url)
+        try:
+            sb.wait_for_element_present("h1", timeout=BROWSER_WAIT_SECONDS)
+        except Exception as e:
+            logger.debug("No title appeared: {}", e)
+        return extract_product(sb.get_page_source())
@@ -0,0 +1,59 @@
+import bisect
+import json
+
+from utils.http_client import fetch
+from utils.links import WB_PRODUCT_RE
+
+from .generic import parse_url_http
+from .registry import register
+
+# Product cards are rendered client side; the storefront reads them from
+# this public JSON endpoint instead.
+CARD_API_URL = (
+    "https://card.wb.ru/cards/v2/detail?appType=1&curr=rub&dest=-1257786&nm={}"
+)
+
+# Photos live on numbered basket hosts chosen by `vol = id // 100000`. These
+# are the upper `vol` bounds of baskets 01, 02, ...; ids past the table go to
+# the next basket, so extend it when Wildberries opens new hosts.
+BASKET_VOL_BOUNDS = (
+    143, 287, 431, 719, 1007, 1061, 1115, 1169, 1313, 1601, 1655, 1919, 2045,
+    2189, 2405, 2621, 2837,
+)
+
+
+def photo_url(product_id: int) -> str:
+    vol, part = product_id // 100000, product_id // 1000
+    basket = bisect.bisect_left(BASKET_VOL_BOUNDS, vol) + 1
+    return (
+        f"https://basket-{basket:02d}.wbbasket.ru/vol{vol}/part{part}/"
+        f"{product_id}/images/big/1.webp"
+    )
+
+
+def _card_price(product: dict) -> float:
+    for size in product.get("sizes") or []:
+        price = (size.get("price") or {}).get("product")
+        if price:
+            return price / 100
+    return (product.get("salePriceU") or 0) / 100
+
+
+@register("wildberries.ru", "wb.ru")
+def parse_url_wildberries(url: str) -> dict | None:
+    match = WB_PRODUCT_RE.search(url)
+    if not match:
+        return parse_url_http(url)
+
+    product_id = int(match.group(1))
+    body, _ = fetch(CARD_API_URL.format(product_id))
+    products = (json.loads(body).get("data") or {}).get("products") or []
+    if not products:
+        return None
+
+    product = products[0]
+    return {
+        "name": product.get("name", ""),
+        "cost": _card_price(product),
+        "photo": photo_url(product_id),
+    }
@@ -0,0 +1,16 @@
+from utils import logger
+
+from .generic import parse_url_http
+from .registry import register
+from .rendered import parse_url_rendered
+
+
+@register("market.yandex.ru")
+def parse_url_yandex_market(url: str) -> dict | None:
+    """Product pages carry JSON-LD, but anti-bot pages need a real browser."""
+    parsed = parse_url_http(url)
+    if parsed:
+        return parsed
+
+    logger.info("HTTP extraction failed, rendering {}", url)
+    return parse_url_rendered(url)
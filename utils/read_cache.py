@@ -0,0 +1,72 @@
+import sqlite3
+import threading
+from typing import Any, Callable, Hashable
+
+from utils.cache import TTLCache
+from utils.metrics import Counter
+
+read_cache_lookups = Counter(
+    "gifts_read_cache_lookups", "Read-through cache lookups.", ["result"]
+)
+
+
+class ReadThroughCache:
+    """LRU cache of gift reads that stays coherent across processes.
+
+    Every entry is stamped with the owner's wishlist version (bumped by
+    triggers on each gift write, from any process) and with a local
+    generation. The generation advances whenever a connection of this
+    process observes a commit, through `PRAGMA data_version` for commits
+    made by other connections and `total_changes` for its own. While the
+    generation is unchanged an entry is served without touching a table.
+    Otherwise the owner's version is re-read and the entry reloaded if it
+    moved.
+    """
+
+    def __init__(self, maxsize: int):
+        self._entries = TTLCache(maxsize=maxsize, ttl=None)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def _current_generation(self, connection: sqlite3.Connection) -> int:
+        data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+        seen = (data_version, connection.total_changes)
+        if getattr(self._local, "seen", None) != seen:
+            self._local.seen = seen
+            with self._lock:
+                self._generation += 1
+        return self._generation
+
+    def get(
+        self,
+        key: Hashable,
+        connection: sqlite3.Connection,
+        current_version: Callable[[str], int],
+        load: Callable[[], tuple[str | None, int, Any]],
+    ) -> Any:
+        """Return the cached value for `key` or load it.
+
+        `load` returns `(owner user_id, owner version, value)` read from a
+        single snapshot. `current_version` re-reads an owner's version.
+        """
+        generation = self._current_generation(connection)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry_generation, owner, version, value = entry
+            if entry_generation == generation:
+                read_cache_lookups.inc(result="hit")
+                return value
+            if current_version(owner) == version:
+                self._entries.set(key, (generation, owner, version, value))
+                read_cache_lookups.inc(result="revalidated")
+                return value
+
+        read_cache_lookups.inc(result="miss")
+        owner, version, value = load()
+        if value is not None:
+            self._entries.set(key, (generation, owner, version, value))
+        return value
+
+    def clear(self):
+        self._entries.clear()
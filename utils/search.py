@@ -0,0 +1,42 @@
+import base64
+import json
+import re
+
+# Sort name -> columns of the keyset cursor, most significant first. The id
+# breaks ties so every cursor points at exactly one position.
+SORT_COLUMNS = {
+    "rank": ("rank", "id"),
+    "id": ("id",),
+    "cost": ("cost", "id"),
+    "-cost": ("cost", "id"),
+}
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def match_query(text: str) -> str | None:
+    """Turn free text into an FTS5 query where every word must match as a prefix.
+
+    Words are quoted, so user input can never be read as FTS5 syntax.
+    """
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def encode_cursor(row: dict, sort: str) -> str:
+    values = [row[column] for column in SORT_COLUMNS[sort]]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> list:
+    """Raises ValueError for cursors that were not issued for `sort`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(values, list) or len(values) != len(SORT_COLUMNS[sort]):
+        raise ValueError("Cursor does not match the sort order")
+    return values
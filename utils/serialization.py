@@ -0,0 +1,48 @@
+import json
+from typing import Any, Iterable
+
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # the stdlib encoder is used without orjson
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    """JSON response for content that is already in its final shape.
+
+    Skips FastAPI's response model validation and `jsonable_encoder`, so it is
+    only for rows that come straight from the database.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def parse_fields(fields: str | None, allowed: tuple[str, ...]) -> tuple[str, ...]:
+    """Validate a `fields=a,b` projection; all of `allowed` when not given."""
+    if not fields:
+        return allowed
+    selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [field for field in selected if field not in allowed]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields {unknown}, allowed: {', '.join(allowed)}",
+        )
+    return selected
+
+
+def project(rows: Iterable[dict], fields: tuple[str, ...]) -> list[dict]:
+    """Keep only `fields` of each row, in that order."""
+    return [{field: row[field] for field in fields} for row in rows]
@@ -1,7 +1,27 @@
 import os
+import time
+import asyncio
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from dotenv import load_dotenv
 
+from utils.config import (
+    BATCH_FLUSH_SECONDS,
+    BATCH_FLUSH_SIZE,
+    DB_POOL_SIZE,
+    DB_BUSY_TIMEOUT_MS,
+    PARSE_CACHE_TTL_SECONDS,
+    PARSE_CACHE_MAX_ENTRIES,
+    READ_CACHE_MAX_ENTRIES,
+)
+from utils.metrics import db_query_duration, timed
+from utils.migrations import migrate
+from utils.read_cache import ReadThroughCache
+from utils.search import SORT_COLUMNS
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -11,88 +31,250 @@ if DATABASE_URL is None:
     )
 
 
+PATCHABLE_GIFT_COLUMNS = (
+    "name",
+    "cost",
+    "link",
+    "photo",
+    "is_reserved",
+    "reserve_owner",
+)
+
+UNTIMED_METHODS = {"create_connection", "create_tables", "close"}
+
+
+def instrument_queries(cls):
+    """Time every public DB method into the db query histogram."""
+    for name, attr in list(vars(cls).items()):
+        if (
+            name.startswith("_")
+            or name in UNTIMED_METHODS
+            or isinstance(attr, (staticmethod, classmethod, property))
+            or not callable(attr)
+        ):
+            continue
+        setattr(cls, name, timed(db_query_duration, query=name)(attr))
+    return cls
+
 
+@instrument_queries
 class DB:
-    def __init__(self):
-        self.connection = None
-        self.create_tables()
+    """Synchronous data access with one SQLite connection per thread."""
+
+    def __init__(self, read_cache_size: int = 0):
+        self.read_cache = ReadThroughCache(read_cache_size) if read_cache_size else None
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection | None:
+        return getattr(self._local, "connection", None)
 
     def create_connection(self):
         if self.connection is None:
-            self.connection = sqlite3.connect(DATABASE_URL)
-            self.connection.row_factory = sqlite3.Row
+            connection = sqlite3.connect(
+                DATABASE_URL,
+                timeout=DB_BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False,
+            )
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
 
     def create_tables(self):
-        create_users_table_query = """
-            CREATE TABLE IF NOT EXISTS users (
-                id TEXT PRIMARY KEY,
-                username TEXT NOT NULL,
-                password TEXT NOT NULL
-            );
-        """
-        create_gifts_table_query = """
-            CREATE TABLE IF NOT EXISTS gifts (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                cost REAL NOT NULL,
-                link TEXT NOT NULL,
-                photo TEXT,
-                is_reserved BOOLEAN NOT NULL,
-                reserve_owner TEXT,
-                user_id TEXT,
-                FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-            );
-        """
+        """Bring the schema up to date; run once per process at startup."""
+        self.create_connection()
+        migrate(self.connection)
+
+    def get_all_gifts(self) -> list[dict]:
+        query = "SELECT * FROM gifts"
 
         self.create_connection()
         cursor = self.connection.cursor()
 
-        cursor.execute(create_users_table_query)
-        cursor.execute(create_gifts_table_query)
+        try:
+            cursor.execute(query)
+            gifts = cursor.fetchall()
+            return [self._gift_from_row(gift) for gift in gifts]
+        finally:
+            cursor.close()
 
-        cursor.connection.commit()
+    def get_gifts_page(
+        self, limit: int, after: str | None = None, user_id: str | None = None
+    ) -> list[dict]:
+        """Return up to `limit` gifts ordered by id, starting after `after`."""
+        conditions = []
+        params = []
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if after is not None:
+            conditions.append("id > ?")
+            params.append(after)
 
-    def get_all_gifts(self) -> list[dict]:
         query = "SELECT * FROM gifts"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limit)
 
         self.create_connection()
         cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params)
+            return [self._gift_from_row(gift) for gift in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def search_gifts(
+        self,
+        limit: int,
+        match: str | None = None,
+        min_cost: float | None = None,
+        max_cost: float | None = None,
+        is_reserved: bool | None = None,
+        user_id: str | None = None,
+        sort: str = "id",
+        after: list | None = None,
+    ) -> list[dict]:
+        """Filter gifts, optionally by an FTS5 `match`, in keyset pages.
 
+        `after` holds the SORT_COLUMNS values of the last row of the previous
+        page. Rows of a `match` search carry their bm25 `rank`.
+        """
+        conditions = []
+        params: list = []
+        if match is not None:
+            query = """
+                SELECT gifts.*, bm25(gifts_fts) AS rank
+                FROM gifts_fts JOIN gifts ON gifts.rowid = gifts_fts.rowid
+            """
+            conditions.append("gifts_fts MATCH ?")
+            params.append(match)
+        else:
+            query = "SELECT gifts.* FROM gifts"
+
+        if min_cost is not None:
+            conditions.append("gifts.cost >= ?")
+            params.append(min_cost)
+        if max_cost is not None:
+            conditions.append("gifts.cost <= ?")
+            params.append(max_cost)
+        if is_reserved is not None:
+            conditions.append("gifts.is_reserved = ?")
+            params.append(is_reserved)
+        if user_id is not None:
+            conditions.append("gifts.user_id = ?")
+            params.append(user_id)
+
+        sort_columns = SORT_COLUMNS[sort]
+        direction = "DESC" if sort.startswith("-") else "ASC"
+        keyset = None
+        if after is not None:
+            operator = "<" if direction == "DESC" else ">"
+            placeholders = ", ".join("?" * len(after))
+            keyset = "({}) " + f"{operator} ({placeholders})"
+
+        # bm25() is only known once the match runs, so rank pages are cut in
+        # an outer query; the other sorts keep the keyset inside to use an index.
+        if sort == "rank":
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query = f"SELECT * FROM ({query})"
+            if keyset:
+                query += " WHERE " + keyset.format(", ".join(sort_columns))
+                params.extend(after)
+        else:
+            if keyset:
+                qualified = ", ".join(f"gifts.{column}" for column in sort_columns)
+                conditions.append(keyset.format(qualified))
+                params.extend(after)
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+
+        order = ", ".join(f"{column} {direction}" for column in sort_columns)
+        query += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+
+        self.create_connection()
+        cursor = self.connection.cursor()
         try:
-            cursor.execute(query)
-            gifts = cursor.fetchall()
-            return [dict(gift) for gift in gifts]
+            cursor.execute(query, params)
+            return [self._gift_from_row(gift) for gift in cursor.fetchall()]
         finally:
             cursor.close()
 
     def get_gifts_by_user_id(self, user_id: str) -> list[dict]:
-        query = "SELECT * FROM gifts WHERE user_id = ?"
         self.create_connection()
+        if self.read_cache is None:
+            return self._select_gifts_by_user_id(user_id)
+
+        def load():
+            with self._read_snapshot():
+                version = self.get_wishlist_version(user_id)
+                return user_id, version, self._select_gifts_by_user_id(user_id)
+
+        return self.read_cache.get(
+            ("user", user_id), self.connection, self.get_wishlist_version, load
+        )
+
+    def _select_gifts_by_user_id(self, user_id: str) -> list[dict]:
+        query = "SELECT * FROM gifts WHERE user_id = ?"
         cursor = self.connection.cursor()
         try:
             cursor.execute(query, (user_id,))
             gifts = cursor.fetchall()
-            return [dict(gift) for gift in gifts]
+            return [self._gift_from_row(gift) for gift in gifts]
         finally:
             cursor.close()
 
     def get_gift_by_id(self, gift_id: str) -> dict | None:
-        query = "SELECT * FROM gifts WHERE id = ?"
         self.create_connection()
+        if self.read_cache is None:
+            return self._select_gift_by_id(gift_id)
+
+        def load():
+            with self._read_snapshot():
+                gift = self._select_gift_by_id(gift_id)
+                if gift is None:
+                    return None, 0, None
+                version = self.get_wishlist_version(gift["user_id"])
+                return gift["user_id"], version, gift
+
+        return self.read_cache.get(
+            ("gift", gift_id), self.connection, self.get_wishlist_version, load
+        )
+
+    def _select_gift_by_id(self, gift_id: str) -> dict | None:
+        query = "SELECT * FROM gifts WHERE id = ?"
         cursor = self.connection.cursor()
         try:
             cursor.execute(query, (gift_id,))
             gift = cursor.fetchone()
             if gift:
-                return dict(gift)
+                return self._gift_from_row(gift)
             return None
         finally:
             cursor.close()
 
+    @contextmanager
+    def _read_snapshot(self):
+        """Run several SELECTs against one consistent WAL snapshot."""
+        self.connection.execute("BEGIN")
+        try:
+            yield
+        finally:
+            self.connection.commit()
+
     def add_gift(self, new_gift: dict):
         query = """
-                INSERT INTO gifts (id, name, cost, link, photo, is_reserved, reserve_owner, user_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO gifts
+                    (id, name, cost, link, photo, thumbnail, is_reserved, reserve_owner, user_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
         self.create_connection()
         cursor = self.connection.cursor()
@@ -105,6 +287,7 @@ class DB:
                     new_gift["cost"],
                     new_gift["link"],
                     new_gift["photo"],
+                    new_gift.get("thumbnail"),
                     new_gift["is_reserved"],
                     new_gift["reserve_owner"],
                     new_gift["user_id"],
@@ -114,7 +297,44 @@ class DB:
         finally:
             cursor.close()
 
-    def update_gift(self, gift_id: str, updated_gift: dict):
+    def add_gifts(self, new_gifts: list[dict]):
+        """Insert many gifts in a single transaction."""
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            self._insert_gifts(cursor, new_gifts)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _insert_gifts(cursor: sqlite3.Cursor, new_gifts: list[dict]):
+        cursor.executemany(
+            """
+            INSERT INTO gifts
+                (id, name, cost, link, photo, thumbnail, is_reserved, reserve_owner, user_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    gift["id"],
+                    gift["name"],
+                    gift["cost"],
+                    gift["link"],
+                    gift["photo"],
+                    gift.get("thumbnail"),
+                    gift["is_reserved"],
+                    gift["reserve_owner"],
+                    gift["user_id"],
+                )
+                for gift in new_gifts
+            ],
+        )
+
+    def update_gift(self, gift_id: str, updated_gift: dict) -> bool:
         query = """
                 UPDATE gifts
                 SET name = ?, cost = ?, link = ?, photo = ?, is_reserved = ?, reserve_owner = ?, user_id = ?
@@ -137,16 +357,70 @@ class DB:
                 ),
             )
             self.connection.commit()
+            return cursor.rowcount > 0
+        finally:
+            cursor.close()
+
+    def patch_gift(self, gift_id: str, fields: dict) -> bool:
+        """Update only the given columns. Returns False if the gift does not exist."""
+        self.create_connection()
+        columns = [column for column in fields if column in PATCHABLE_GIFT_COLUMNS]
+        if not columns:
+            return self._select_gift_by_id(gift_id) is not None
+
+        query = "UPDATE gifts SET {} WHERE id = ?".format(
+            ", ".join(f"{column} = ?" for column in columns)
+        )
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, [fields[column] for column in columns] + [gift_id])
+            self.connection.commit()
+            return cursor.rowcount > 0
+        finally:
+            cursor.close()
+
+    def reserve_gift(self, gift_id: str, reserve_owner: str) -> bool:
+        """Reserve a gift in one conditional UPDATE.
+
+        Returns False if the gift is already reserved or does not exist, so
+        concurrent reservers can never overwrite each other.
+        """
+        query = """
+                UPDATE gifts SET is_reserved = 1, reserve_owner = ?
+                WHERE id = ? AND is_reserved = 0
+            """
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, (reserve_owner, gift_id))
+            self.connection.commit()
+            return cursor.rowcount == 1
+        finally:
+            cursor.close()
+
+    def unreserve_gift(self, gift_id: str, reserve_owner: str) -> bool:
+        """Release a reservation, only on behalf of whoever made it."""
+        query = """
+                UPDATE gifts SET is_reserved = 0, reserve_owner = ''
+                WHERE id = ? AND is_reserved = 1 AND reserve_owner = ?
+            """
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, (gift_id, reserve_owner))
+            self.connection.commit()
+            return cursor.rowcount == 1
         finally:
             cursor.close()
 
-    def delete_gift(self, gift_id: str):
+    def delete_gift(self, gift_id: str) -> bool:
         query = "DELETE FROM gifts WHERE id = ?"
         self.create_connection()
         cursor = self.connection.cursor()
         try:
             cursor.execute(query, (gift_id,))
             self.connection.commit()
+            return cursor.rowcount > 0
         finally:
             cursor.close()
 
@@ -189,6 +463,30 @@ class DB:
         finally:
             cursor.close()
 
+    def get_users_page(self, limit: int, after: str | None = None) -> list[dict]:
+        """Return up to `limit` users ordered by id, starting after `after`."""
+        if after is None:
+            query = "SELECT * FROM users ORDER BY id LIMIT ?"
+            params = (limit,)
+        else:
+            query = "SELECT * FROM users WHERE id > ? ORDER BY id LIMIT ?"
+            params = (after, limit)
+
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params)
+            return [
+                {
+                    "user_id": user[0],
+                    "username": user[1],
+                    "password": user[2],
+                }
+                for user in cursor.fetchall()
+            ]
+        finally:
+            cursor.close()
+
     def get_all_users(self):
         query = "SELECT * FROM users"
         self.create_connection()
@@ -207,6 +505,555 @@ class DB:
         finally:
             cursor.close()
 
+    def get_cached_parse(
+        self, key: str, ttl: int = PARSE_CACHE_TTL_SECONDS
+    ) -> dict | None:
+        """Return a fresh cached parse result for `key` and count the hit or miss."""
+        now = time.time()
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT name, cost, photo, thumbnail, created_at
+                FROM parse_cache WHERE key = ?
+                """,
+                (key,),
+            )
+            row = cursor.fetchone()
+            if row and now - row["created_at"] <= ttl:
+                cursor.execute(
+                    "UPDATE parse_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._count_parse_cache("hits", cursor)
+                self.connection.commit()
+                return {
+                    "name": row["name"],
+                    "cost": row["cost"],
+                    "photo": row["photo"],
+                    "thumbnail": row["thumbnail"],
+                }
+
+            if row:
+                cursor.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+            self._count_parse_cache("misses", cursor)
+            self.connection.commit()
+            return None
+        finally:
+            cursor.close()
+
+    def set_cached_parse(
+        self, key: str, parsed: dict, max_entries: int = PARSE_CACHE_MAX_ENTRIES
+    ):
+        """Store a parse result and evict least recently used entries over the limit."""
+        now = time.time()
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                """
+                INSERT INTO parse_cache
+                    (key, name, cost, photo, thumbnail, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    name = excluded.name,
+                    cost = excluded.cost,
+                    photo = excluded.photo,
+                    thumbnail = excluded.thumbnail,
+                    created_at = excluded.created_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (
+                    key,
+                    parsed["name"],
+                    parsed["cost"],
+                    parsed["photo"],
+                    parsed.get("thumbnail"),
+                    now,
+                    now,
+                ),
+            )
+            cursor.execute(
+                """
+                DELETE FROM parse_cache WHERE key IN (
+                    SELECT key FROM parse_cache
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (max_entries,),
+            )
+            if cursor.rowcount > 0:
+                self._count_parse_cache("evictions", cursor, cursor.rowcount)
+            self.connection.commit()
+        finally:
+            cursor.close()
+
+    def get_parse_cache_stats(self) -> dict[str, int]:
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT COUNT(*) FROM parse_cache")
+            stats = {"hits": 0, "misses": 0, "evictions": 0}
+            stats["entries"] = cursor.fetchone()[0]
+            cursor.execute("SELECT name, value FROM parse_cache_stats")
+            stats.update({row["name"]: row["value"] for row in cursor.fetchall()})
+            return stats
+        finally:
+            cursor.close()
+
+    def clear_thumbnails(self, names: list[str]) -> int:
+        """Forget thumbnails whose files were evicted; gifts fall back to photo."""
+        self.create_connection()
+        cursor = self.connection.cursor()
+        cleared = 0
+        try:
+            for start in range(0, len(names), 500):
+                chunk = names[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for table in ("gifts", "parse_cache", "gift_batch_items"):
+                    cursor.execute(
+                        f"UPDATE {table} SET thumbnail = NULL "
+                        f"WHERE thumbnail IN ({placeholders})",
+                        chunk,
+                    )
+                    if table == "gifts":
+                        cleared += cursor.rowcount
+            self.connection.commit()
+            return cleared
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def get_stale_gifts(self, limit: int, checked_before: float) -> list[dict]:
+        """Gifts whose price is oldest, unreserved ones first."""
+        query = """
+            SELECT id, link, cost FROM gifts
+            WHERE is_reserved = ? AND (price_checked_at IS NULL OR price_checked_at < ?)
+            ORDER BY price_checked_at
+            LIMIT ?
+        """
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            gifts = []
+            for is_reserved in (0, 1):
+                if len(gifts) >= limit:
+                    break
+                cursor.execute(query, (is_reserved, checked_before, limit - len(gifts)))
+                gifts.extend(dict(gift) for gift in cursor.fetchall())
+            return gifts
+        finally:
+            cursor.close()
+
+    def record_price_check(self, gift_id: str, cost: float) -> bool:
+        """Stamp a price check. Returns True if the price changed.
+
+        The cost is only written when it differs, so unchanged prices neither
+        grow the history nor invalidate cached wishlists.
+        """
+        checked_at = time.time()
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                "UPDATE gifts SET price_checked_at = ? WHERE id = ?",
+                (checked_at, gift_id),
+            )
+            cursor.execute(
+                "UPDATE gifts SET cost = ? WHERE id = ? AND cost IS NOT ?",
+                (cost, gift_id, cost),
+            )
+            changed = cursor.rowcount > 0
+            self.connection.commit()
+            return changed
+        finally:
+            cursor.close()
+
+    def get_price_history(self, gift_id: str) -> list[dict]:
+        query = """
+            SELECT checked_at, cost FROM gift_prices
+            WHERE gift_id = ? ORDER BY checked_at
+        """
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, (gift_id,))
+            return [dict(price) for price in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def get_wishlist_version(self, user_id: str) -> int:
+        """Version of a user's wishlist, bumped by triggers on every gift write."""
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                "SELECT version FROM wishlist_versions WHERE user_id = ?", (user_id,)
+            )
+            row = cursor.fetchone()
+            return row[0] if row else 0
+        finally:
+            cursor.close()
+
+    def create_batch(self, batch_id: str, user_id: str, items: list[dict]):
+        """Register a bulk import. Items are queued unless they carry a status."""
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                """
+                INSERT INTO gift_batches (id, user_id, total, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (batch_id, user_id, len(items), time.time()),
+            )
+            cursor.executemany(
+                """
+                INSERT INTO gift_batch_items
+                    (gift_id, batch_id, link, status, name, cost, photo, thumbnail)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        item["gift_id"],
+                        batch_id,
+                        item["link"],
+                        item.get("status", "queued"),
+                        item.get("name"),
+                        item.get("cost"),
+                        item.get("photo"),
+                        item.get("thumbnail"),
+                    )
+                    for item in items
+                ],
+            )
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def complete_batch_item(
+        self,
+        batch_id: str,
+        gift_id: str,
+        parsed: dict | None = None,
+        error: str | None = None,
+        flush_size: int = BATCH_FLUSH_SIZE,
+        flush_seconds: float = BATCH_FLUSH_SECONDS,
+    ) -> int:
+        """Record one parsed (or failed) item.
+
+        Parsed gifts not yet written are written in the same transaction once
+        `flush_size` of them are pending, `flush_seconds` have passed since the
+        batch was last written, or no item is queued any more. Returns how many
+        gifts this call wrote.
+        """
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            if parsed is not None:
+                cursor.execute(
+                    """
+                    UPDATE gift_batch_items
+                    SET status = 'done', name = ?, cost = ?, photo = ?, thumbnail = ?
+                    WHERE gift_id = ? AND batch_id = ?
+                    """,
+                    (
+                        parsed["name"],
+                        parsed["cost"],
+                        parsed["photo"],
+                        parsed.get("thumbnail"),
+                        gift_id,
+                        batch_id,
+                    ),
+                )
+            else:
+                cursor.execute(
+                    """
+                    UPDATE gift_batch_items SET status = 'failed', error = ?
+                    WHERE gift_id = ? AND batch_id = ?
+                    """,
+                    (error, gift_id, batch_id),
+                )
+            written = self._flush_batch(cursor, batch_id, flush_size, flush_seconds)
+            self.connection.commit()
+            return written
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def join_inflight_parse(
+        self,
+        key: str,
+        gift_id: str,
+        user_id: str,
+        link: str,
+        task_id: str,
+        stale_before: float,
+    ) -> str:
+        """Wait for the parse of `key`, joining one that is already running.
+
+        Returns the id of the task that will create the gift. It is `task_id`
+        when no parse started after `stale_before` is in flight, and the caller
+        must then enqueue that task. Joiners copy the leader's `created_at`,
+        so a stuck parse goes stale however many requests join it.
+        """
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                """
+                SELECT task_id, created_at FROM parse_inflight
+                WHERE key = ? AND created_at >= ?
+                ORDER BY created_at LIMIT 1
+                """,
+                (key, stale_before),
+            )
+            row = cursor.fetchone()
+            if row:
+                leader_task_id, created_at = row["task_id"], row["created_at"]
+            else:
+                leader_task_id, created_at = task_id, time.time()
+            cursor.execute(
+                """
+                INSERT INTO parse_inflight
+                    (gift_id, key, user_id, link, task_id, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (gift_id, key, user_id, link, leader_task_id, created_at),
+            )
+            self.connection.commit()
+            return leader_task_id
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def complete_inflight_parse(self, key: str, parsed: dict) -> list[str]:
+        """Create a gift for every request waiting on `key` and return their ids."""
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(
+                "SELECT gift_id, user_id, link FROM parse_inflight WHERE key = ?",
+                (key,),
+            )
+            gifts = [
+                {
+                    "id": row["gift_id"],
+                    "user_id": row["user_id"],
+                    "link": row["link"],
+                    "is_reserved": False,
+                    "reserve_owner": "",
+                    **parsed,
+                }
+                for row in cursor.fetchall()
+            ]
+            self._insert_gifts(cursor, gifts)
+            cursor.execute("DELETE FROM parse_inflight WHERE key = ?", (key,))
+            self.connection.commit()
+            return [gift["id"] for gift in gifts]
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def abandon_inflight_parse(self, key: str, task_id: str) -> int:
+        """Drop every request waiting on a parse that failed or never ran."""
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                "DELETE FROM parse_inflight WHERE key = ? AND task_id = ?",
+                (key, task_id),
+            )
+            self.connection.commit()
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    def flush_batch(self, batch_id: str) -> int:
+        """Write the batch's remaining gifts if nothing is queued any more."""
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            written = self._flush_batch(cursor, batch_id)
+            self.connection.commit()
+            return written
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _flush_batch(
+        self,
+        cursor: sqlite3.Cursor,
+        batch_id: str,
+        flush_size: int = 0,
+        flush_seconds: float = 0,
+    ) -> int:
+        now = time.time()
+        cursor.execute(
+            """
+            SELECT user_id, COALESCE(flushed_at, created_at) AS flushed_at,
+                EXISTS (
+                    SELECT 1 FROM gift_batch_items
+                    WHERE batch_id = gift_batches.id AND status = 'queued'
+                ) AS queued
+            FROM gift_batches WHERE id = ? AND flushed = 0
+            """,
+            (batch_id,),
+        )
+        batch = cursor.fetchone()
+        if batch is None:
+            return 0
+
+        cursor.execute(
+            """
+            SELECT gift_id, link, name, cost, photo, thumbnail FROM gift_batch_items
+            WHERE batch_id = ? AND status = 'done' AND written = 0
+            """,
+            (batch_id,),
+        )
+        pending = cursor.fetchall()
+        if (
+            batch["queued"]
+            and len(pending) < flush_size
+            and now - batch["flushed_at"] < flush_seconds
+        ):
+            return 0
+
+        new_gifts = [
+            {
+                "id": item["gift_id"],
+                "user_id": batch["user_id"],
+                "is_reserved": False,
+                "reserve_owner": "",
+                "link": item["link"],
+                "name": item["name"],
+                "cost": item["cost"],
+                "photo": item["photo"],
+                "thumbnail": item["thumbnail"],
+            }
+            for item in pending
+        ]
+        self._insert_gifts(cursor, new_gifts)
+        cursor.executemany(
+            "UPDATE gift_batch_items SET written = 1 WHERE gift_id = ?",
+            [(gift["id"],) for gift in new_gifts],
+        )
+        cursor.execute(
+            "UPDATE gift_batches SET flushed = ?, flushed_at = ? WHERE id = ?",
+            (not batch["queued"], now, batch_id),
+        )
+        return len(new_gifts)
+
+    def get_batch(self, batch_id: str) -> dict | None:
+        self.create_connection()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(
+                "SELECT id, user_id, total, flushed FROM gift_batches WHERE id = ?",
+                (batch_id,),
+            )
+            batch = cursor.fetchone()
+            if batch is None:
+                return None
+            cursor.execute(
+                """
+                SELECT gift_id, link, status, name, cost, photo, thumbnail, error
+                FROM gift_batch_items WHERE batch_id = ?
+                """,
+                (batch_id,),
+            )
+            items = [dict(item) for item in cursor.fetchall()]
+            return {
+                "batch_id": batch["id"],
+                "user_id": batch["user_id"],
+                "total": batch["total"],
+                "completed": bool(batch["flushed"]),
+                "queued": sum(item["status"] == "queued" for item in items),
+                "done": sum(item["status"] == "done" for item in items),
+                "failed": sum(item["status"] == "failed" for item in items),
+                "items": items,
+            }
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _count_parse_cache(name: str, cursor: sqlite3.Cursor, amount: int = 1):
+        cursor.execute(
+            """
+            INSERT INTO parse_cache_stats (name, value) VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET value = value + excluded.value
+            """,
+            (name, amount),
+        )
+
+    @staticmethod
+    def _gift_from_row(row: sqlite3.Row) -> dict:
+        gift = dict(row)
+        gift["is_reserved"] = bool(gift["is_reserved"])
+        return gift
+
+    def close(self):
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class AsyncDB:
+    """Awaitable facade over DB.
+
+    Every DB method is run on a bounded thread pool, so queries never block
+    the event loop and each worker thread keeps its own SQLite connection.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DB_POOL_SIZE,
+        read_cache_size: int = READ_CACHE_MAX_ENTRIES,
+    ):
+        self._db = DB(read_cache_size=read_cache_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="db"
+        )
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self._db, name)
+        if not callable(attr):
+            return attr
+
+        async def method(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        method.__name__ = name
+        return method
+
     def close(self):
-        if self.connection:
-            self.connection.close()
+        self._executor.shutdown(wait=True)
+        self._db.close()
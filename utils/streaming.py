@@ -0,0 +1,96 @@
+import csv
+import io
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi.responses import StreamingResponse
+
+from utils.config import STREAM_BATCH_SIZE
+from utils.serialization import dumps, project
+
+FetchPage = Callable[[int, str | None], Awaitable[list[dict]]]
+
+
+async def iter_pages(
+    fetch_page: FetchPage, cursor_key: str, batch_size: int = STREAM_BATCH_SIZE
+) -> AsyncIterator[list[dict]]:
+    """Walk a keyset-paginated query one page at a time."""
+    after = None
+    while True:
+        rows = await fetch_page(batch_size, after)
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+        after = rows[-1][cursor_key]
+
+
+async def iter_ndjson(
+    fetch_page: FetchPage,
+    cursor_key: str,
+    batch_size: int = STREAM_BATCH_SIZE,
+    fields: tuple[str, ...] | None = None,
+) -> AsyncIterator[bytes]:
+    """Walk a keyset-paginated query and yield one NDJSON chunk per batch.
+
+    With `fields` each row is projected to those keys; the cursor is read
+    before projecting, so it need not be one of them.
+    """
+    async for rows in iter_pages(fetch_page, cursor_key, batch_size):
+        selected = project(rows, fields) if fields else rows
+        yield b"".join(dumps(row) + b"\n" for row in selected)
+
+
+async def iter_csv(
+    fetch_page: FetchPage,
+    cursor_key: str,
+    fields: tuple[str, ...],
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> AsyncIterator[str]:
+    """Like iter_ndjson, but a CSV header and then one CSV chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+
+    async for rows in iter_pages(fetch_page, cursor_key, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([row[field] for field in fields] for row in rows)
+        yield buffer.getvalue()
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines, keeping their line endings.
+
+    Only one line is buffered at a time; a longer line than `max_line_bytes`
+    raises ValueError.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield (line + b"\n").decode("utf-8")
+        if len(pending) > max_line_bytes:
+            raise ValueError(f"Line longer than {max_line_bytes} bytes")
+    if pending:
+        yield pending.decode("utf-8")
+
+
+def ndjson_response(
+    fetch_page: FetchPage, cursor_key: str, fields: tuple[str, ...] | None = None
+) -> StreamingResponse:
+    return StreamingResponse(
+        iter_ndjson(fetch_page, cursor_key, fields=fields),
+        media_type="application/x-ndjson",
+    )
+
+
+def csv_response(
+    fetch_page: FetchPage, cursor_key: str, fields: tuple[str, ...]
+) -> StreamingResponse:
+    return StreamingResponse(
+        iter_csv(fetch_page, cursor_key, fields), media_type="text/csv"
+    )
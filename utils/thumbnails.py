@@ -0,0 +1,129 @@
+import hashlib
+import os
+import re
+from functools import cache
+from io import BytesIO
+
+from . import logger
+from .config import (
+    THUMBNAIL_DIR,
+    THUMBNAIL_MAX_DIR_BYTES,
+    THUMBNAIL_MAX_SOURCE_BYTES,
+    THUMBNAIL_QUALITY,
+    THUMBNAIL_SIZE,
+)
+from .http_client import fetch
+
+THUMBNAIL_NAME = re.compile(r"^[0-9a-f]{64}\.(webp|jpg)$")
+
+
+@cache
+def _pillow():
+    """Pillow's Image module, imported on first use: the API only serves files."""
+    try:
+        from PIL import Image
+    except ImportError:  # thumbnails are skipped without Pillow
+        return None
+    return Image
+
+
+@cache
+def _extension() -> str:
+    from PIL import features
+
+    return "webp" if features.check("webp") else "jpg"
+
+
+def thumbnail_name(data: bytes, extension: str) -> str:
+    """Content address of encoded thumbnail bytes."""
+    return f"{hashlib.sha256(data).hexdigest()}.{extension}"
+
+
+def thumbnail_path(name: str) -> str | None:
+    """Path of a stored thumbnail, or None for names that are not ours."""
+    if not THUMBNAIL_NAME.match(name):
+        return None
+    return os.path.join(THUMBNAIL_DIR, name)
+
+
+def make_thumbnail(photo_url: str | None) -> str | None:
+    """Download `photo_url` and store a small re-encoded copy.
+
+    Returns the thumbnail file name, or None when Pillow is not installed or
+    the photo can not be fetched or decoded; the gift keeps its remote photo.
+    Photos that encode to the same bytes share one file.
+    """
+    Image = _pillow()
+    if Image is None or not photo_url:
+        return None
+
+    extension = _extension()
+    try:
+        body, _ = fetch(photo_url, max_bytes=THUMBNAIL_MAX_SOURCE_BYTES)
+        encoded = BytesIO()
+        with Image.open(BytesIO(body)) as image:
+            # Lets the JPEG decoder scale down while decoding.
+            image.draft("RGB", (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            if extension == "jpg" or image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGB")
+            image.save(
+                encoded,
+                "WEBP" if extension == "webp" else "JPEG",
+                quality=THUMBNAIL_QUALITY,
+            )
+    except Exception as e:
+        logger.warning("Thumbnail for {} failed: {}", photo_url, e)
+        return None
+
+    data = encoded.getvalue()
+    name = thumbnail_name(data, extension)
+    path = os.path.join(THUMBNAIL_DIR, name)
+    if os.path.exists(path):
+        os.utime(path)
+        return name
+
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Thumbnail for {} failed: {}", photo_url, e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    return name
+
+
+def evict_thumbnails(max_bytes: int = THUMBNAIL_MAX_DIR_BYTES) -> list[str]:
+    """Delete the least recently used thumbnails until the directory fits.
+
+    Returns the removed names; rows that point at them must be cleared.
+    """
+    try:
+        entries = [
+            entry
+            for entry in os.scandir(THUMBNAIL_DIR)
+            if entry.is_file() and THUMBNAIL_NAME.match(entry.name)
+        ]
+    except FileNotFoundError:
+        return []
+
+    stats = [(entry.path, entry.stat()) for entry in entries]
+    total = sum(stat.st_size for _, stat in stats)
+    removed = []
+    for path, stat in sorted(stats, key=lambda item: item[1].st_mtime):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= stat.st_size
+        removed.append(os.path.basename(path))
+
+    if removed:
+        logger.info("Evicted {} thumbnails", len(removed))
+    return removed
@@ -0,0 +1,125 @@
+import csv
+import json
+from typing import AsyncIterator
+from uuid import uuid4
+
+from utils.config import IMPORT_MAX_LINE_BYTES
+from utils.links import is_supported_link
+
+# Enough to recreate a gift without parsing its link again.
+EXPORT_FIELDS = ("link", "name", "cost", "photo", "is_reserved", "reserve_owner")
+REQUIRED_FIELDS = ("link", "name", "cost")
+
+_TRUE = {"1", "true", "yes"}
+_FALSE = {"", "0", "false", "no"}
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"is_reserved must be true or false, got {value!r}")
+
+
+def gift_from_record(record: dict, user_id: str) -> dict:
+    """Validate one imported record into a new gift of `user_id`."""
+    missing = [field for field in REQUIRED_FIELDS if record.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+
+    link = str(record["link"]).strip()
+    if not is_supported_link(link):
+        raise ValueError(f"unsupported link {link!r}")
+    try:
+        cost = float(record["cost"])
+    except (TypeError, ValueError):
+        raise ValueError(f"cost must be a number, got {record['cost']!r}")
+    if cost < 0:
+        raise ValueError("cost must not be negative")
+
+    return {
+        "id": str(uuid4()),
+        "user_id": user_id,
+        "link": link,
+        "name": str(record["name"]).strip(),
+        "cost": cost,
+        "photo": record.get("photo") or None,
+        "is_reserved": _parse_bool(record.get("is_reserved", False)),
+        "reserve_owner": record.get("reserve_owner") or "",
+    }
+
+
+async def _ndjson_records(lines: AsyncIterator[str]):
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "expected a JSON object"
+            continue
+        yield line_no, record, None
+
+
+async def _csv_records(lines: AsyncIterator[str]):
+    """CSV records with a header row; quoted fields may span lines."""
+    header = None
+    line_no = start = 0
+    pending = ""
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            start = line_no
+        pending += line
+        # Quotes are doubled inside quoted fields, so an odd count means the
+        # record continues on the next line.
+        if pending.count('"') % 2:
+            if len(pending) > IMPORT_MAX_LINE_BYTES:
+                raise ValueError(f"Record at line {start} is too long")
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip().lstrip("\ufeff") for name in values]
+            missing = [field for field in REQUIRED_FIELDS if field not in header]
+            if missing:
+                raise ValueError(f"CSV header lacks {', '.join(missing)}")
+            continue
+        if len(values) != len(header):
+            yield start, None, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        yield start, dict(zip(header, values)), None
+
+    if pending:
+        yield start, None, "unterminated quoted field"
+
+
+async def iter_import_gifts(
+    lines: AsyncIterator[str], format: str, user_id: str
+) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """Yield `(line number, gift, None)` or `(line number, None, error)`.
+
+    Bad records are reported and skipped; a CSV without the required columns
+    raises ValueError before any gift is yielded.
+    """
+    records = _csv_records(lines) if format == "csv" else _ndjson_records(lines)
+    async for line_no, record, error in records:
+        if error is not None:
+            yield line_no, None, error
+            continue
+        try:
+            yield line_no, gift_from_record(record, user_id), None
+        except ValueError as e:
+            yield line_no, None, str(e)